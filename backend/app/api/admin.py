@@ -5,10 +5,12 @@ import os
 from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from ..config import get_config, reload_config
+from ..llm import http
 from ..llm.provider import LLMProvider
 from ..utils.exceptions import format_error_message
 
@@ -55,7 +57,7 @@ class ModelsResponse(BaseModel):
 
 
 @router.get("/providers", response_model=ProvidersResponse)
-def get_providers() -> ProvidersResponse:
+async def get_providers() -> ProvidersResponse:
     """Get list of available LLM providers."""
     providers = [
         ProviderInfo(value="qwen", label="Qwen (Alibaba DashScope)"),
@@ -66,7 +68,7 @@ def get_providers() -> ProvidersResponse:
 
 
 @router.get("/config", response_model=LLMConfigResponse)
-def get_llm_config() -> LLMConfigResponse:
+async def get_llm_config() -> LLMConfigResponse:
     """Get current LLM configuration."""
     try:
         config = get_config()
@@ -129,7 +131,7 @@ def update_llm_config(request: LLMConfigUpdateRequest) -> Dict[str, Any]:
 
 
 @router.get("/models", response_model=ModelsResponse)
-def get_available_models(provider: Optional[str] = None, ollama_url: Optional[str] = None) -> ModelsResponse:
+async def get_available_models(provider: Optional[str] = None, ollama_url: Optional[str] = None) -> ModelsResponse:
     """Get available models for a provider."""
     try:
         config = get_config()
@@ -159,30 +161,29 @@ def get_available_models(provider: Optional[str] = None, ollama_url: Optional[st
                 url = f"{base_url}/api/tags"
                 timeout = httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=5.0)
                 
-                with httpx.Client(timeout=timeout) as client:
-                    response = client.get(url)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # Extract model names from Ollama response
-                    models = []
-                    ollama_models = []
-                    if "models" in data:
-                        for model_info in data["models"]:
-                            model_name = model_info.get("name", "")
-                            if model_name:
-                                models.append(model_name)
-                                ollama_models.append(OllamaModelInfo(
-                                    name=model_name,
-                                    size=model_info.get("size"),
-                                    modified_at=model_info.get("modified_at")
-                                ))
-                    
-                    return ModelsResponse(
-                        provider=provider_lower,
-                        models=models,
-                        ollama_models=ollama_models
-                    )
+                response = await http.shared_client.get(url, timeout=timeout)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                
+                # Extract model names from Ollama response
+                models = []
+                ollama_models = []
+                if "models" in data:
+                    for model_info in data["models"]:
+                        model_name = model_info.get("name", "")
+                        if model_name:
+                            models.append(model_name)
+                            ollama_models.append(OllamaModelInfo(
+                                name=model_name,
+                                size=model_info.get("size"),
+                                modified_at=model_info.get("modified_at")
+                            ))
+                
+                return ModelsResponse(
+                    provider=provider_lower,
+                    models=models,
+                    ollama_models=ollama_models
+                )
             except httpx.ConnectError:
                 raise HTTPException(
                     status_code=503,
@@ -196,7 +197,7 @@ def get_available_models(provider: Optional[str] = None, ollama_url: Optional[st
             except httpx.HTTPStatusError as exc:
                 raise HTTPException(
                     status_code=exc.response.status_code,
-                    detail=f"Ollama API错误: {exc.response.text[:200]}"
+                    detail=f"Ollama API错误: {exc.response.content[:200].decode('utf-8', errors='replace')}"
                 )
             except Exception as exc:
                 raise HTTPException(
@@ -1,7 +1,6 @@
 """Chatbot API routes."""
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -10,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from ..llm import DashScopeError
 from ..models import ChatRequest
 from ..utils.exceptions import format_error_message
+from .sse import DONE_EVENT, SSE_HEADERS, chunk_event, coalesce, error_event, keepalive
 
 if TYPE_CHECKING:
     from ..service.chat import ChatService
@@ -41,36 +41,28 @@ def setup_chat_routes(chat_service: ChatService) -> None:
 
 
 @router.post("/agent/message/stream")
-def agent_message_stream(
+async def agent_message_stream(
     request: ChatRequest,
     chat_service: ChatService = Depends(get_chat_service),
 ) -> StreamingResponse:
     """Handle chat request with streaming response."""
     
-    def generate():
+    async def generate():
         try:
-            for chunk in chat_service.chat_stream(request):
-                # Format as SSE
-                data = json.dumps({"type": "chunk", "content": chunk}, ensure_ascii=False)
-                yield f"data: {data}\n\n"
+            async for chunk in coalesce(chat_service.chat_stream(request)):
+                yield chunk_event(chunk)
             # Send done signal
-            yield "data: " + json.dumps({"type": "done"}, ensure_ascii=False) + "\n\n"
+            yield DONE_EVENT
         except DashScopeError as exc:
             error_msg = format_error_message(exc, "Error processing request")
-            error_data = json.dumps({"type": "error", "content": error_msg}, ensure_ascii=False)
-            yield f"data: {error_data}\n\n"
+            yield error_event(error_msg)
         except Exception as exc:
             error_msg = format_error_message(exc, "An error occurred while processing your request")
-            error_data = json.dumps({"type": "error", "content": error_msg}, ensure_ascii=False)
-            yield f"data: {error_data}\n\n"
+            yield error_event(error_msg)
     
     return StreamingResponse(
-        generate(),
+        keepalive(generate()),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
     )
 
@@ -1,7 +1,8 @@
 """Common API routes (health check, configuration)."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
 
 from ..config import get_config, reload_config
 from ..models import ConfigUpdateRequest
@@ -9,21 +10,26 @@ from ..utils.exceptions import format_error_message
 
 router = APIRouter()
 
+# The health body never changes, so it is serialized once instead of per probe
+_HEALTH_BODY = b'{"status":"ok"}'
 
-@router.get("/health")
-def health_check() -> dict:
+
+@router.get("/health", response_class=Response)
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@router.get("/config")
-def get_default_config() -> dict:
+@router.get("/config", response_class=Response)
+async def get_default_config() -> Response:
     """Get default configuration including system prompt template and checklist."""
     config = get_config()
-    return {
+    # The body only changes when the config does, so it is serialized once per config
+    body = config.cached("default_config_json", lambda: orjson.dumps({
         "system_prompt_template": config.system_prompt_template,
         "checklist": [{"id": item.id, "description": item.description} for item in config.default_checklist],
-    }
+    }))
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/config")
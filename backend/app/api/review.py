@@ -1,16 +1,18 @@
 """Single-pass MRT review API routes."""
 from __future__ import annotations
 
-import base64
+import asyncio
 from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 
 from ..llm import DashScopeError
 from ..models import ReviewRequest, ReviewResponse
-from ..service.file_parser import parse_file_content
+from ..service.file_parser import PARSE_POOL_SIZE, parse_binary_file_in_pool, parse_file_content
 from ..utils.constants import MAX_FILE_SIZE_BYTES, SUPPORTED_EXTENSIONS
 from ..utils.exceptions import FileProcessingError, format_error_message
+from .sse import DONE_EVENT, SSE_HEADERS, chunk_event, coalesce, error_event, keepalive
 
 if TYPE_CHECKING:
     from ..service.review import ReviewService
@@ -19,6 +21,9 @@ else:
 
 router = APIRouter()
 
+# Caps PDF/Word uploads being parsed at once so a burst doesn't queue unbounded work on the pool
+_PARSE_SLOTS = asyncio.Semaphore(PARSE_POOL_SIZE)
+
 # Global service instance (will be set by setup_review_routes)
 _review_service: ReviewService | None = None
 
@@ -42,24 +47,52 @@ def setup_review_routes(review_service: ReviewService) -> None:
 
 
 @router.post("/review", response_model=ReviewResponse)
-def review(
+async def review(
     request: ReviewRequest,
     review_service: ReviewService = Depends(get_review_service),
 ) -> ReviewResponse:
     """Review MRT content using single-pass review."""
     try:
-        return review_service.review(request)
+        return await review_service.review(request)
     except DashScopeError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
 
+@router.post("/review/stream")
+async def review_stream(
+    request: ReviewRequest,
+    review_service: ReviewService = Depends(get_review_service),
+) -> StreamingResponse:
+    """Review MRT content, streaming the review as server-sent events."""
+
+    async def generate():
+        try:
+            async for chunk in coalesce(review_service.review_stream(request)):
+                yield chunk_event(chunk)
+            yield DONE_EVENT
+        except DashScopeError as exc:
+            error_msg = format_error_message(exc, "Error processing review")
+            yield error_event(error_msg)
+        except Exception as exc:
+            error_msg = format_error_message(exc, "An error occurred while processing the review")
+            yield error_event(error_msg)
+
+    return StreamingResponse(
+        keepalive(generate()),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.post("/upload/file")
-def upload_file(file: UploadFile = File(...)) -> dict:
+async def upload_file(file: UploadFile = File(...)) -> dict:
     """Upload and parse file, returning text content."""
     try:
-        # Validate file size
-        content = file.file.read()
-        if len(content) > MAX_FILE_SIZE_BYTES:
+        # Validate file size from the spooled upload without reading it into memory
+        file.file.seek(0, 2)
+        file_size = file.file.tell()
+        file.file.seek(0)
+        if file_size > MAX_FILE_SIZE_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size is {MAX_FILE_SIZE_BYTES / (1024 * 1024):.0f}MB"
@@ -75,18 +108,18 @@ def upload_file(file: UploadFile = File(...)) -> dict:
         
         # Determine if binary or text
         if file_ext in ['pdf', 'doc', 'docx']:
-            # Encode as base64 for binary files
-            base64_content = base64.b64encode(content).decode('utf-8')
-            file_content = f"[BINARY_FILE:.{file_ext}:{base64_content}]"
+            # PDF/Word extraction is CPU-bound, so it runs in the parser process pool off the event loop,
+            # reading the spooled upload in chunks rather than all at once
+            async with _PARSE_SLOTS:
+                text_content = await parse_binary_file_in_pool(f".{file_ext}", file.file)
         else:
             # Text file
+            content = await file.read()
             try:
                 file_content = content.decode('utf-8')
             except UnicodeDecodeError:
                 file_content = content.decode('utf-8', errors='ignore')
-        
-        # Parse file
-        text_content = parse_file_content(file.filename, file_content)
+            text_content = parse_file_content(file.filename, file_content)
         
         if text_content is None:
             raise FileProcessingError(
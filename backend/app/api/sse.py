@@ -0,0 +1,129 @@
+"""Server-sent event framing shared by the streaming routes."""
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+import orjson
+
+# Streamed text is merged until this many characters are buffered ...
+CHUNK_MERGE_THRESHOLD = 64
+# ... or this many seconds have passed since the first buffered chunk
+FLUSH_INTERVAL = 0.03
+
+# Frame sent once a stream has finished, encoded once at import
+DONE_EVENT = b'data: {"type":"done"}\n\n'
+
+# Comment frame sent while the model is thinking so proxies and clients don't drop an idle stream
+PING_EVENT = b": ping\n\n"
+PING_INTERVAL = 15.0
+
+# Returned by _Reader.next when no item arrived before the timeout
+_TIMEOUT = object()
+
+# Headers that keep proxies from buffering or caching an event stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def chunk_event(content: str) -> bytes:
+    """Encode a text chunk as an SSE ``data:`` frame."""
+    return b'data: {"type":"chunk","content":%b}\n\n' % orjson.dumps(content)
+
+
+def error_event(message: str) -> bytes:
+    """Encode an error message as an SSE ``data:`` frame."""
+    return b'data: {"type":"error","content":%b}\n\n' % orjson.dumps(message)
+
+
+class _Reader:
+    """Read an async iterator with timeouts, without cancelling a read that is still in progress.
+
+    The next item is requested as soon as the previous one is returned, so reading upstream
+    overlaps with the caller writing the previous item to the client (a one-item read-ahead).
+    """
+
+    __slots__ = ("_iterator", "_pending")
+
+    def __init__(self, items: AsyncIterator):
+        self._iterator = items.__aiter__()
+        self._pending: Optional[asyncio.Future] = None
+
+    async def next(self, timeout: Optional[float]):
+        """Return the next item, or ``_TIMEOUT`` if none arrived in time; raises StopAsyncIteration at the end."""
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._iterator.__anext__())
+        done, _ = await asyncio.wait((self._pending,), timeout=timeout)
+        if not done:
+            return _TIMEOUT
+        item = self._pending.result()
+        self._pending = asyncio.ensure_future(self._iterator.__anext__())
+        return item
+
+    async def aclose(self) -> None:
+        """Cancel any pending read and close the underlying iterator."""
+        if self._pending is not None:
+            self._pending.cancel()
+            await asyncio.wait((self._pending,))
+            if not self._pending.cancelled():
+                # Mark a read-ahead that already failed as retrieved so asyncio doesn't warn about it
+                self._pending.exception()
+            self._pending = None
+        aclose = getattr(self._iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def coalesce(
+    chunks: AsyncIterator[str],
+    min_chars: int = CHUNK_MERGE_THRESHOLD,
+    interval: float = FLUSH_INTERVAL,
+) -> AsyncIterator[str]:
+    """Merge small text chunks, flushing once ``min_chars`` are buffered or ``interval`` seconds pass."""
+    # A timer flush waits on the pending read rather than cancelling the upstream HTTP read
+    reader = _Reader(chunks)
+    loop = asyncio.get_running_loop()
+    parts: List[str] = []
+    size = 0
+    deadline = 0.0
+    try:
+        while True:
+            try:
+                chunk = await reader.next(max(0.0, deadline - loop.time()) if parts else None)
+            except StopAsyncIteration:
+                break
+            if chunk is _TIMEOUT:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+                continue
+
+            if not parts:
+                deadline = loop.time() + interval
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= min_chars:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+        if parts:
+            yield "".join(parts)
+    finally:
+        await reader.aclose()
+
+
+async def keepalive(events: AsyncIterator[bytes], interval: float = PING_INTERVAL) -> AsyncIterator[bytes]:
+    """Pass SSE frames through, sending a comment frame whenever the stream is idle for ``interval`` seconds."""
+    reader = _Reader(events)
+    try:
+        while True:
+            try:
+                event = await reader.next(interval)
+            except StopAsyncIteration:
+                break
+            yield PING_EVENT if event is _TIMEOUT else event
+    finally:
+        await reader.aclose()
@@ -1,52 +1,131 @@
 from __future__ import annotations
 
+import copy
+import functools
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 import yaml
 
 from .models import ChecklistItem
 
+# Use the libyaml C loader when available; it is much faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed config files keyed by (resolved path, mtime in ns, size) so repeated loads skip YAML parsing;
+# saves store the dict they wrote, since coarse mtimes (e.g. Docker mounts) can repeat across writes
+_YAML_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+# Config saves run in the threadpool (sync endpoints); serialize their read-modify-write of the
+# file so concurrent saves can't interleave writes or drop each other's changes
+_SAVE_LOCK = threading.Lock()
+
 
 class Config:
     """Application configuration loader."""
 
+    __slots__ = (
+        "_path",
+        "_config",
+        "_system_prompt_template",
+        "_llm_provider",
+        "_llm_model",
+        "_llm_azure_model",
+        "_llm_ollama_model",
+        "_llm_timeout",
+        "_checklist_batch_size",
+        "_llm_max_concurrency",
+        "_default_checklist",
+        "_derived",
+    )
+
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
             config_path = os.getenv("MRT_REVIEW_CONFIG", str(Path(__file__).parent / "config.yaml"))
-        self._config = self._load_config(config_path)
+        self._path = config_path
+        self._set_config(self._load_config(config_path))
+
+    def _set_config(self, config: Dict[str, Any]) -> None:
+        """Store raw config and derive the values read on every request."""
+        llm_config = config.get("llm", {})
+        template = llm_config.get("system_prompt_template", "")
+
+        self._config = config
+        self._system_prompt_template: str = template if template and template.strip() else ""
+        self._llm_provider: str = llm_config.get("provider", "qwen")
+        self._llm_model: str = llm_config.get("model", "qwen-max")
+        self._llm_azure_model: str = llm_config.get("azure_model", "gpt-4")
+        self._llm_ollama_model: str = llm_config.get("ollama_model", "qwen2.5:32b")
+        self._llm_timeout: float = float(llm_config.get("timeout", 30.0))
+        self._checklist_batch_size: int = max(1, int(llm_config.get("checklist_batch_size", 8)))
+        self._llm_max_concurrency: int = max(1, int(llm_config.get("max_concurrency", 8)))
         self._default_checklist: Optional[List[ChecklistItem]] = None
+        self._derived: Dict[Hashable, Any] = {}
+
+    def cached(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get a value derived from this configuration, computing it once until the config changes."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = factory()
+            return value
 
     @staticmethod
     def _load_config(path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         config_file = Path(path)
-        if not config_file.exists():
-            raise FileNotFoundError(f"Configuration file not found: {path}")
-        with open(config_file, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        try:
+            stat = config_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {path}") from None
+
+        cached = _YAML_CACHE.get((str(config_file.resolve()), stat.st_mtime_ns, stat.st_size))
+        if cached is None:
+            with open(config_file, "r", encoding="utf-8") as f:
+                cached = yaml.load(f, Loader=_YAML_LOADER) or {}
+            _cache_parsed_config(config_file, cached, stat)
+        return cached
+
+    def _write_config(self, config: Dict[str, Any]) -> None:
+        """Write configuration to the config file and switch to it."""
+        config_file = Path(self.config_path)
+        with open(config_file, "w", encoding="utf-8") as f:
+            yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        # Cache what was just written so a reload can't pick up a stale parse with the same mtime
+        _cache_parsed_config(config_file, config)
+        self._set_config(config)
 
     @property
     def system_prompt_template(self) -> str:
         """Get default system prompt template from config.yaml."""
-        template = self._config.get("llm", {}).get("system_prompt_template", "")
-        if not template or not template.strip():
+        if not self._system_prompt_template:
             raise ValueError(
                 "system_prompt_template is required in config.yaml. "
                 "Please ensure config.yaml contains llm.system_prompt_template."
             )
-        return template
+        return self._system_prompt_template
 
     @property
     def llm_model(self) -> str:
         """Get LLM model name."""
-        return self._config.get("llm", {}).get("model", "qwen-max")
+        return self._llm_model
 
     @property
     def llm_timeout(self) -> float:
         """Get LLM request timeout in seconds."""
-        return float(self._config.get("llm", {}).get("timeout", 30.0))
+        return self._llm_timeout
+
+    @property
+    def llm_max_concurrency(self) -> int:
+        """Get the maximum number of review completions in flight at once."""
+        return self._llm_max_concurrency
+
+    @property
+    def checklist_batch_size(self) -> int:
+        """Get the maximum number of checklist items reviewed in one LLM call."""
+        return self._checklist_batch_size
 
     @property
     def default_checklist(self) -> List[ChecklistItem]:
@@ -72,91 +151,89 @@ class Config:
     @property
     def config_path(self) -> str:
         """Get the path to the configuration file."""
-        return os.getenv("MRT_REVIEW_CONFIG", str(Path(__file__).parent / "config.yaml"))
+        return self._path
 
     def save_config(self, system_prompt_template: str, checklist: List[ChecklistItem]) -> None:
         """Save system prompt template and checklist to configuration file."""
-        config_file = Path(self.config_path)
-        
-        # Load existing config to preserve other settings
-        existing_config = self._config.copy()
-        
-        # Update system prompt template
-        if "llm" not in existing_config:
-            existing_config["llm"] = {}
-        existing_config["llm"]["system_prompt_template"] = system_prompt_template
+        with _SAVE_LOCK:
+            # Load existing config to preserve other settings (deep copy keeps the parse cache intact)
+            existing_config = copy.deepcopy(self._config)
         
-        # Update checklist
-        existing_config["default_checklist"] = [
-            {"id": item.id, "description": item.description} for item in checklist
-        ]
+            # Update system prompt template
+            if "llm" not in existing_config:
+                existing_config["llm"] = {}
+            existing_config["llm"]["system_prompt_template"] = system_prompt_template
         
-        # Write back to file
-        with open(config_file, "w", encoding="utf-8") as f:
-            yaml.dump(existing_config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            # Update checklist
+            existing_config["default_checklist"] = [
+                {"id": item.id, "description": item.description} for item in checklist
+            ]
         
-        # Reload config
-        self._config = existing_config
-        self._default_checklist = None  # Reset cache
+            # Write back to file and reload config
+            self._write_config(existing_config)
 
     def save_llm_config(self, provider: str, model: str) -> None:
         """Save LLM provider and model to configuration file."""
-        config_file = Path(self.config_path)
+        with _SAVE_LOCK:
+            # Load existing config to preserve other settings (deep copy keeps the parse cache intact)
+            existing_config = copy.deepcopy(self._config)
         
-        # Load existing config to preserve other settings
-        existing_config = self._config.copy()
+            # Update LLM provider and model
+            if "llm" not in existing_config:
+                existing_config["llm"] = {}
+            existing_config["llm"]["provider"] = provider
         
-        # Update LLM provider and model
-        if "llm" not in existing_config:
-            existing_config["llm"] = {}
-        existing_config["llm"]["provider"] = provider
+            # Update model based on provider
+            if provider == "ollama":
+                existing_config["llm"]["ollama_model"] = model
+            elif provider == "azure_openai":
+                existing_config["llm"]["azure_model"] = model
+            else:
+                existing_config["llm"]["model"] = model
         
-        # Update model based on provider
-        if provider == "ollama":
-            existing_config["llm"]["ollama_model"] = model
-        elif provider == "azure_openai":
-            existing_config["llm"]["azure_model"] = model
-        else:
-            existing_config["llm"]["model"] = model
-        
-        # Write back to file
-        with open(config_file, "w", encoding="utf-8") as f:
-            yaml.dump(existing_config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        
-        # Reload config
-        self._config = existing_config
+            # Write back to file and reload config
+            self._write_config(existing_config)
 
     @property
     def llm_provider(self) -> str:
         """Get LLM provider name."""
-        return self._config.get("llm", {}).get("provider", "qwen")
+        return self._llm_provider
 
     @property
     def llm_azure_model(self) -> str:
         """Get Azure OpenAI model name."""
-        return self._config.get("llm", {}).get("azure_model", "gpt-4")
+        return self._llm_azure_model
 
     @property
     def llm_ollama_model(self) -> str:
         """Get Ollama model name."""
-        return self._config.get("llm", {}).get("ollama_model", "qwen2.5:32b")
+        return self._llm_ollama_model
+
+
+def _cache_parsed_config(config_file: Path, config: Dict[str, Any], stat: Optional[os.stat_result] = None) -> None:
+    """Remember the parsed contents of a config file, dropping entries for its older versions."""
+    if stat is None:
+        stat = config_file.stat()
+    resolved = str(config_file.resolve())
+    for key in [key for key in _YAML_CACHE if key[0] == resolved]:
+        del _YAML_CACHE[key]
+    _YAML_CACHE[(resolved, stat.st_mtime_ns, stat.st_size)] = config
 
 
-# Global configuration instance
-_config_instance: Optional[Config] = None
+# Path of the global configuration; None uses MRT_REVIEW_CONFIG or the bundled config.yaml
+_config_path: Optional[str] = None
 
 
+@functools.cache
 def get_config() -> Config:
     """Get global configuration instance."""
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config()
-    return _config_instance
+    return Config(_config_path)
 
 
 def reload_config(config_path: Optional[str] = None) -> Config:
     """Reload configuration from file."""
-    global _config_instance
-    _config_instance = Config(config_path)
-    return _config_instance
+    global _config_path
+    _config_path = config_path
+    get_config.cache_clear()
+    return get_config()
 
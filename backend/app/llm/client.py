@@ -1,30 +1,64 @@
 """Unified LLM client for both completion and chat tasks."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
 import logging
+import os
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from ..config import get_config
 from ..models import ReviewResponse
+from ..service.prompt import build_system_prompts, build_user_message, system_prompts_digest
 from .factory import LLMClientFactory
 from .provider import LLMError
 
 logger = logging.getLogger(__name__)
 
+# Constant replies used when no API key is configured, built once instead of per request
+_NO_API_KEY_RESPONSE = ReviewResponse(
+    suggestions=[],
+    summary=None,
+    raw_content="API key is not available. Please configure your API key to use the review feature."
+)
+_NO_REPLY = "未能获取模型回复。"
+_EMPTY_CHAT_REPLY = "您好，我可以帮助您。请告诉我您需要什么帮助。"
+_EMPTY_MESSAGE_REPLY = "请提供您的消息内容。"
+
 
 class LLMClient:
     """Unified LLM client for both completion and chat tasks."""
 
+    __slots__ = ("_client", "_config", "_review_cache", "_review_cache_size", "_review_inflight", "_review_slots")
+
     def __init__(self, provider_client=None):
         """Initialize LLM client. Uses provider from config if not specified."""
         self._client = provider_client or LLMClientFactory.get_default_client()
         self._config = self._client._config
+        # Bounds concurrent review completions across requests to respect provider rate limits
+        self._review_slots = asyncio.Semaphore(self._config.llm_max_concurrency)
+        # Bounded LRU of review replies so resubmitting the same MRT skips the LLM round-trip
+        self._review_cache: OrderedDict[Tuple[str, str, bytes, bytes], str] = OrderedDict()
+        self._review_cache_size = int(os.getenv("REVIEW_CACHE_SIZE", "256"))
+        # Reviews currently running, so identical concurrent submissions share one LLM call
+        self._review_inflight: Dict[Tuple[str, str, bytes, bytes], asyncio.Future] = {}
     
+    def reload(self) -> None:
+        """Rebind the provider client to the current configuration."""
+        self._client = LLMClientFactory.get_default_client()
+        self._config = self._client._config
+        self._review_slots = asyncio.Semaphore(self._config.llm_max_concurrency)
+
     def _get_client(self):
-        """Get provider client, recreating it if needed to use latest config."""
-        # Always get a fresh client to ensure we use the latest config
-        # This allows config updates to take effect without restarting the server
-        return LLMClientFactory.get_default_client()
+        """Get provider client, rebinding it once the global config has been reloaded."""
+        # Config updates replace the global Config instance, so an identity check is enough
+        # to pick them up without restarting the server or rebuilding the client per call
+        if self._config is not get_config():
+            self.reload()
+        return self._client
 
     @property
     def has_api_key(self) -> bool:
@@ -36,83 +70,193 @@ class LLMClient:
         """Get model name."""
         return self._get_client().model
 
-    def review(self, mrt_content: str, software_requirement: Optional[str] = None) -> ReviewResponse:
+    async def keep_warm(self, interval: float = 60.0) -> None:
+        """Keep pooled connections to the LLM endpoint open, re-pinging every ``interval`` seconds."""
+        # The interval stays below the typical 90s idle timeout of cloud load balancers
+        while True:
+            try:
+                client = self._get_client()
+                # Without an API key no LLM requests are made, so there are no connections to keep warm
+                if client.has_api_key:
+                    await client.warm_up()
+            except Exception as exc:
+                # Keep pinging through bad config edits (e.g. an unknown provider) until they are fixed
+                logger.warning("LLM connection warm-up failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def review(self, mrt_content: str, software_requirement: Optional[str] = None) -> ReviewResponse:
         """Review MRT content against checklist and software requirement."""
-        from ..config import get_config
-        
-        if not self.has_api_key:
+        if not self._get_client().has_api_key:
             logger.warning("No API key available, using heuristic review")
-            return ReviewResponse(
-                suggestions=[],
-                summary=None,
-                raw_content="API key is not available. Please configure your API key to use the review feature."
-            )
+            return _NO_API_KEY_RESPONSE
 
-        config = get_config()
+        raw_content = "".join([chunk async for chunk in self.review_stream(mrt_content, software_requirement)])
+        return ReviewResponse(suggestions=[], summary=None, raw_content=raw_content)
+
+    async def review_stream(self, mrt_content: str, software_requirement: Optional[str] = None):
+        """Review MRT content against checklist and software requirement, yielding the reply as it is generated."""
         client = self._get_client()
+        if not client.has_api_key:
+            logger.warning("No API key available, using heuristic review")
+            yield _NO_API_KEY_RESPONSE.raw_content
+            return
+
+        config = get_config()
         model_name = client.model
         mrt_length = len(mrt_content)
         checklist_count = len(config.default_checklist)
         has_requirement = software_requirement is not None and software_requirement.strip() != ""
         
-        logger.info(f"LLM review - Provider: {type(client).__name__}, Model: {model_name}, MRT: {mrt_length} chars, Checklist: {checklist_count}, Has requirement: {has_requirement}")
+        logger.info(
+            "LLM review - Provider: %s, Model: %s, MRT: %d chars, Checklist: %d, Has requirement: %s",
+            type(client).__name__, model_name, mrt_length, checklist_count, has_requirement,
+        )
         start_time = time.time()
 
-        # Import here to avoid circular dependency
-        from ..service.prompt import build_system_prompt, build_user_message
-        system_prompt = build_system_prompt(software_requirement)
+        system_prompts = build_system_prompts(software_requirement)
         user_message = build_user_message(mrt_content, software_requirement)
 
+        cache_key = (
+            type(client).__name__,
+            model_name,
+            system_prompts_digest(software_requirement),
+            hashlib.blake2b(user_message.encode("utf-8"), digest_size=16).digest(),
+        )
+        cached = self._review_cache.get(cache_key)
+        if cached is not None:
+            self._review_cache.move_to_end(cache_key)
+            logger.info("LLM review served from cache - Response: %d chars", len(cached))
+            yield cached
+            return
+
+        pending = self._review_inflight.get(cache_key)
+        if pending is not None:
+            # An identical review is already running; wait for its reply instead of calling the LLM again
+            raw_content = await asyncio.shield(pending)
+            if raw_content is not None:
+                logger.info("LLM review joined an identical in-flight review - Response: %d chars", len(raw_content))
+                yield raw_content
+                return
+            # The running review failed or was abandoned; fall through and run this one
+        flight = None
+        if cache_key not in self._review_inflight:
+            flight = self._review_inflight[cache_key] = asyncio.get_running_loop().create_future()
+
         try:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ]
-
-            logger.info("-------------  messages begin-------------------")
-            logger.info(f"System prompt length: {len(system_prompt)} chars")
-            logger.info(f"System prompt preview: {system_prompt[:300]}...")
-            logger.info(f"User message length: {len(user_message)} chars")
-            logger.info(f"User message preview: {user_message[:300]}...")
-            logger.info("-------------  messages end-------------------")  
-
-            payload = client._normalize_payload(messages, model=model_name)
-            payload["max_tokens"] = 2000
-
-            data = client._make_request("chat/completions", payload)
-            raw_content = client._extract_response(data)
+            if logger.isEnabledFor(logging.DEBUG):
+                for system_prompt in system_prompts:
+                    logger.debug("System prompt (%d chars): %s...", len(system_prompt), system_prompt[:300])
+                logger.debug("User message (%d chars): %s...", len(user_message), user_message[:300])
+
+            if len(system_prompts) == 1:
+                payload = self._review_payload(client, model_name, system_prompts[0], user_message)
+                parts = []
+                async for chunk in self._stream_in_slot(client._make_stream_request("chat/completions", payload)):
+                    parts.append(chunk)
+                    yield chunk
+                raw_content = "".join(parts)
+                if not raw_content:
+                    raw_content = _NO_REPLY
+                    yield raw_content
+            else:
+                # Large checklists are split into batches reviewed concurrently, so latency is bounded
+                # by the slowest batch and the model attends to a few items at a time; results keep
+                # checklist order and the semaphore caps how many run at once
+                replies = await asyncio.gather(
+                    *(self._complete(client, model_name, prompt, user_message) for prompt in system_prompts)
+                )
+                raw_content = "\n\n".join(
+                    f"## Checklist batch [{index}]\n\n{reply}" for index, reply in enumerate(replies, 1)
+                )
+                yield raw_content
             
             elapsed_time = time.time() - start_time
-            logger.info(f"LLM review completed - Time: {elapsed_time:.2f}s, Response: {len(raw_content)} chars")
-            
-            return ReviewResponse(suggestions=[], summary=None, raw_content=raw_content)
+            logger.info("LLM review completed - Time: %.2fs, Response: %d chars", elapsed_time, len(raw_content))
+            if flight is not None:
+                flight.set_result(raw_content)
+
+            if self._review_cache_size > 0 and _NO_REPLY not in raw_content:
+                self._review_cache[cache_key] = raw_content
+                if len(self._review_cache) > self._review_cache_size:
+                    self._review_cache.popitem(last=False)
             
         except LLMError as exc:
             elapsed_time = time.time() - start_time
-            logger.error(f"LLM review failed after {elapsed_time:.2f}s - {exc}")
+            logger.error("LLM review failed after %.2fs - %s", elapsed_time, exc)
             raise
         except Exception as exc:
             elapsed_time = time.time() - start_time
-            logger.error(f"LLM review failed after {elapsed_time:.2f}s - Unexpected error: {exc}", exc_info=True)
+            logger.error("LLM review failed after %.2fs - Unexpected error: %s", elapsed_time, exc, exc_info=True)
             raise LLMError(str(exc)) from exc
+        finally:
+            if flight is not None:
+                del self._review_inflight[cache_key]
+                if not flight.done():
+                    # Waiting duplicates run their own review rather than inheriting this failure
+                    flight.set_result(None)
+
+    @staticmethod
+    def _review_payload(client, model_name: str, system_prompt: str, user_message: str) -> Dict[str, Any]:
+        """Build the chat completions payload for one review call."""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        payload = client._normalize_payload(messages, model=model_name)
+        payload["max_tokens"] = 2000
+        return payload
+
+    async def _stream_in_slot(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Relay an upstream stream, holding a review slot only while the upstream call runs."""
+        # The upstream is read by its own task into a queue, so a slow client draining the reply
+        # doesn't keep the slot (and the provider capacity it stands for) busy
+        queue: asyncio.Queue = asyncio.Queue()
 
-    def chat_stream(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None):
+        async def pump() -> None:
+            try:
+                async with self._review_slots:
+                    async for chunk in chunks:
+                        queue.put_nowait(chunk)
+            finally:
+                queue.put_nowait(None)
+
+        pump_task = asyncio.ensure_future(pump())
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+            # Re-raise upstream errors once everything received before them has been relayed
+            await pump_task
+        finally:
+            if not pump_task.done():
+                pump_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await pump_task
+
+    async def _complete(self, client, model_name: str, system_prompt: str, user_message: str) -> str:
+        """Run one review completion, streaming and assembling the reply."""
+        payload = self._review_payload(client, model_name, system_prompt, user_message)
+        # Stream and assemble the reply so tokens are consumed as they are generated
+        async with self._review_slots:
+            raw_content = "".join([chunk async for chunk in client._make_stream_request("chat/completions", payload)])
+        return raw_content or _NO_REPLY
+
+    async def chat_stream(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None):
         """Send chat messages to LLM and get streaming response."""
-        if not self.has_api_key:
+        client = self._get_client()
+        if not client.has_api_key:
             # Fallback: yield complete heuristic response
             response = self._heuristic_chat(messages)
             yield response
             return
 
         try:
-            client = self._get_client()
             system_msg = {"role": "system", "content": system_prompt or ""}
             all_messages = [system_msg] + messages
             
             payload = client._normalize_payload(all_messages, model=client.model)
             
             # Make streaming request
-            for chunk in client._make_stream_request("chat/completions", payload):
+            async for chunk in client._make_stream_request("chat/completions", payload):
                 yield chunk
                 
         except LLMError as exc:
@@ -123,11 +267,11 @@ class LLMClient:
     def _heuristic_chat(self, messages: List[Dict[str, str]]) -> str:
         """Fallback response when API key is not available."""
         if not messages:
-            return "您好，我可以帮助您。请告诉我您需要什么帮助。"
+            return _EMPTY_CHAT_REPLY
 
         last_message = messages[-1].get("content", "")
         if not last_message:
-            return "请提供您的消息内容。"
+            return _EMPTY_MESSAGE_REPLY
 
         return f"收到您的消息：{last_message[:100]}。这是一个测试回复，请配置 API key 以使用真实 LLM。"
 
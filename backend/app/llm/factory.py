@@ -5,7 +5,8 @@ from __future__ import annotations
 
 from typing import Optional
 
-from .provider import LLMProvider, BaseLLMClient, QwenClient, AzureOpenAIClient, OllamaClient, LLMError
+from ..config import get_config
+from .provider import LLMProvider, QwenClient, AzureOpenAIClient, OllamaClient
 
 
 class LLMClientFactory:
@@ -26,13 +27,11 @@ class LLMClientFactory:
         Raises:
             ValueError: If provider is not supported or configuration is invalid
         """
-        from ..config import get_config
-
         config = get_config()
 
         # Get provider from config if not specified
         if provider is None:
-            provider_name = config._config.get("llm", {}).get("provider", "qwen")
+            provider_name = config.llm_provider
             try:
                 provider = LLMProvider(provider_name.lower())
             except ValueError:
@@ -0,0 +1,17 @@
+"""Shared HTTP client for outbound LLM calls."""
+from __future__ import annotations
+
+import httpx
+
+# Process-wide async HTTP client so every LLM call reuses pooled keep-alive (and HTTP/2)
+# connections instead of paying a TCP + TLS handshake per request, and concurrent requests
+# are multiplexed on the event loop. Timeouts are passed per request.
+shared_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+)
+
+
+async def close_shared_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    await shared_client.aclose()
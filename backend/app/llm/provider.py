@@ -4,13 +4,53 @@ Supports multiple LLM providers with unified interface.
 """
 from __future__ import annotations
 
+import asyncio
+import gzip
+import logging
+import os
+import socket
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
 from ..config import get_config
+from . import http
+
+logger = logging.getLogger(__name__)
+
+# Lowercase host fragments identifying OpenAI-compatible proxies in front of Azure OpenAI
+_PROXY_INDICATORS = ("gptsapi.net", "proxy", "openrouter", "together", "anyscale")
+
+# Request bodies larger than this are gzip-compressed when LLM_GZIP_REQUESTS is enabled
+_GZIP_MIN_BYTES = 4096
+# Statuses a server may answer an undecodable (compressed) body with; the request is resent uncompressed
+_GZIP_REJECTED_STATUSES = frozenset({400, 415, 422})
+
+
+def _error_snippet(response: httpx.Response, limit: int = 200) -> str:
+    """Decode at most ``limit`` bytes of an error body instead of decoding the whole body first."""
+    try:
+        content = response.content
+    except httpx.ResponseNotRead:
+        return ""
+    return content[:limit].decode("utf-8", errors="replace")
+
+
+async def _aiter_line_batches(response: httpx.Response):
+    """Yield the complete lines received in each network read of a streaming response."""
+    buffer = bytearray()
+    async for data in response.aiter_bytes():
+        buffer += data
+        end = buffer.rfind(b"\n")
+        if end >= 0:
+            lines = buffer[:end].split(b"\n")
+            del buffer[:end + 1]
+            yield lines
+    if buffer:
+        yield [buffer]
 
 
 class LLMProvider(str, Enum):
@@ -28,9 +68,23 @@ class LLMError(RuntimeError):
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
 
+    __slots__ = ("api_key", "has_api_key", "_config", "_model", "_timeout", "_headers", "_urls", "_gzip_requests")
+
+    # Whether the provider can accept gzip-encoded request bodies (Content-Encoding: gzip);
+    # compression is only used when also enabled with LLM_GZIP_REQUESTS
+    supports_gzip_requests = True
+
     def __init__(self, api_key: Optional[str] = None, config=None):
         self.api_key = api_key or self._get_api_key()
+        self.has_api_key = bool(self.api_key)
         self._config = config or get_config()
+        # Clients are rebuilt when the config is reloaded, so the model name is fixed per instance
+        self._model = self._get_model_name()
+        self._timeout: Optional[httpx.Timeout] = None
+        self._headers: Optional[Dict[str, str]] = None
+        self._urls: Dict[str, str] = {}
+        # Hosted endpoints and proxies often don't decode compressed bodies, so this is opt-in
+        self._gzip_requests = self.supports_gzip_requests and os.getenv("LLM_GZIP_REQUESTS", "false").lower() in ("1", "true", "yes")
 
     @abstractmethod
     def _get_api_key(self) -> Optional[str]:
@@ -48,13 +102,8 @@ class BaseLLMClient(ABC):
         pass
 
     @abstractmethod
-    def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make HTTP request to LLM API."""
-        pass
-
-    @abstractmethod
-    def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
-        """Make streaming HTTP request to LLM API. Returns generator of chunks."""
+    async def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
+        """Make streaming HTTP request to LLM API. Returns async generator of chunks."""
         pass
 
     @abstractmethod
@@ -62,32 +111,167 @@ class BaseLLMClient(ABC):
         """Normalize payload format for the specific provider."""
         pass
 
-    @abstractmethod
-    def _extract_response(self, data: Dict[str, Any]) -> str:
-        """Extract response text from provider-specific response format."""
-        pass
-
     @abstractmethod
     def _extract_stream_chunk(self, chunk_data: Dict[str, Any]) -> Optional[str]:
         """Extract text chunk from streaming response. Returns None if not a content chunk."""
         pass
 
-    @property
-    def has_api_key(self) -> bool:
-        """Check if API key is available."""
-        return bool(self.api_key)
+    def _build_headers(self) -> Dict[str, str]:
+        """Build HTTP headers for API requests."""
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def _build_url(self, endpoint: str) -> str:
+        """Build request URL for an API endpoint."""
+        return f"{self._get_base_url()}/{endpoint}"
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get HTTP headers, built once per client."""
+        if self._headers is None:
+            self._headers = self._build_headers()
+        return self._headers
+
+    def _get_url(self, endpoint: str) -> str:
+        """Get request URL for an endpoint, built once per client."""
+        url = self._urls.get(endpoint)
+        if url is None:
+            url = self._urls[endpoint] = self._build_url(endpoint)
+        return url
+
+    def _get_timeout(self) -> httpx.Timeout:
+        """Get request timeout, rebuilt only when the configured read timeout changes."""
+        read_timeout = self._config.llm_timeout
+        timeout = self._timeout
+        if timeout is None or timeout.read != read_timeout:
+            timeout = self._timeout = httpx.Timeout(connect=30.0, read=read_timeout, write=30.0, pool=30.0)
+        return timeout
 
     @property
     def model(self) -> str:
         """Get model name."""
-        return self._get_model_name()
+        return self._model
+
+    async def warm_up(self, connections: int = 4) -> None:
+        """Open pooled connections to the API host so the next request skips DNS, TCP and TLS setup."""
+        try:
+            url = self._get_base_url()
+        except ValueError:
+            return
+        await asyncio.gather(
+            *(http.shared_client.head(url, timeout=5.0) for _ in range(connections)),
+            return_exceptions=True,
+        )
+
+    def _encode_body(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a request payload, gzip-compressing large bodies when the provider accepts it."""
+        body = orjson.dumps(payload)
+        if self._gzip_requests and len(body) > _GZIP_MIN_BYTES:
+            return gzip.compress(body, compresslevel=1), {**headers, "Content-Encoding": "gzip"}
+        return body, headers
+
+    def _disable_gzip_requests(self, status_code: int) -> None:
+        """Stop compressing request bodies after the server rejected a compressed one."""
+        logger.warning(
+            "%s rejected a gzip request body (%s); sending uncompressed bodies", type(self).__name__, status_code
+        )
+        self._gzip_requests = False
+
+    async def _stream(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: httpx.Timeout,
+        sse: bool = True,
+    ):
+        """POST a streaming request and yield its text; error bodies are logged before raising."""
+        body, request_headers = self._encode_body(payload, headers)
+        async with http.shared_client.stream(
+            "POST", url, content=body, headers=request_headers, timeout=timeout
+        ) as response:
+            rejected_status = response.status_code
+            if rejected_status not in _GZIP_REJECTED_STATUSES or request_headers is headers:
+                await self._check_stream_status(response)
+                async for content in self._iter_stream_content(response, sse=sse):
+                    yield content
+                return
+        # The compressed body may have been rejected; send it again uncompressed
+        async with http.shared_client.stream(
+            "POST", url, content=orjson.dumps(payload), headers=headers, timeout=timeout
+        ) as response:
+            self._note_gzip_rejection(rejected_status, response.status_code)
+            await self._check_stream_status(response)
+            async for content in self._iter_stream_content(response, sse=sse):
+                yield content
+
+    def _note_gzip_rejection(self, compressed_status: int, plain_status: int) -> None:
+        """Turn compression off when the uncompressed retry got past the status the compressed body hit."""
+        # 415 always means the encoding; a 400/422 repeated for the plain body is a genuine request error
+        if compressed_status == 415 or plain_status != compressed_status:
+            self._disable_gzip_requests(compressed_status)
+
+    @staticmethod
+    async def _check_stream_status(response: httpx.Response) -> None:
+        """Log the error body of a failed streaming response and raise for its status."""
+        if response.status_code != 200:
+            error_text = ""
+            try:
+                await response.aread()
+                error_text = _error_snippet(response, 500)
+            except Exception:
+                pass
+            logger.error("Streaming error response from %s (status %s): %s", response.url, response.status_code, error_text)
+            response.raise_for_status()
+
+    async def _iter_stream_content(self, response: httpx.Response, sse: bool = True):
+        """Yield text from a streaming response, joining the chunks decoded from each network read.
+
+        SSE streams carry ``data: {...}`` lines terminated by ``data: [DONE]``; otherwise every
+        line is a JSON object and the stream ends at one with ``"done": true``.
+        """
+        async for lines in _aiter_line_batches(response):
+            parts = []
+            finished = False
+            for line in lines:
+                line = line.strip()
+                if sse:
+                    if not line.startswith(b"data: "):
+                        continue
+                    line = line[6:]  # Remove "data: " prefix
+                    if line == b"[DONE]":
+                        finished = True
+                        break
+                    # Role-only deltas, usage and filter events carry no text; skip them unparsed
+                    if b'"content"' not in line:
+                        continue
+                elif not line:
+                    continue
+                try:
+                    chunk_data = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if not sse and chunk_data.get("done", False):
+                    finished = True
+                    break
+                try:
+                    content = self._extract_stream_chunk(chunk_data)
+                except Exception as e:
+                    logger.warning("Error parsing stream chunk: %s", e)
+                    continue
+                if content:
+                    parts.append(content)
+
+            if parts:
+                yield "".join(parts)
+            if finished:
+                return
 
 
 class QwenClient(BaseLLMClient):
     """Qwen (Alibaba DashScope) LLM client."""
 
+    __slots__ = ()
+
     def _get_api_key(self) -> Optional[str]:
-        import os
         return os.getenv("DASHSCOPE_API_KEY") or os.getenv("QWEN_API_KEY")
 
     def _get_base_url(self) -> str:
@@ -99,124 +283,31 @@ class QwenClient(BaseLLMClient):
     def _normalize_payload(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> Dict[str, Any]:
         """Normalize payload for DashScope/Qwen API."""
         return {
-            "model": model or self._get_model_name(),
+            "model": model or self._model,
             "messages": messages,
         }
 
-    def _extract_response(self, data: Dict[str, Any]) -> str:
-        """Extract response from DashScope/Qwen format."""
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "未能获取模型回复。")
-
-    def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make HTTP request to DashScope API."""
-        import logging
-        import time
-
-        logger = logging.getLogger(__name__)
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        base_url = self._get_base_url()
-        url = f"{base_url}/{endpoint}"
-
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
-
-        model = payload.get("model", "unknown")
-        messages_count = len(payload.get("messages", []))
-        logger.debug(f"Qwen API request - URL: {url}, Model: {model}, Messages: {messages_count}")
-
-        request_start = time.time()
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(url, json=payload, headers=headers)
-                request_time = time.time() - request_start
-
-                logger.debug(f"Qwen API response - Status: {response.status_code}, Time: {request_time:.2f}s")
-                response.raise_for_status()
-
-                result = response.json()
-                logger.debug(f"Qwen response parsed successfully - Size: {len(str(result))} chars")
-                return result
-
-        except httpx.TimeoutException as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Qwen API timeout after {request_time:.2f}s")
-            raise LLMError(f"请求超时：API响应时间超过 {self._config.llm_timeout} 秒。") from exc
-        except httpx.ConnectError as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Qwen API connection error after {request_time:.2f}s: {str(exc)}")
-            error_msg = str(exc)
-            if "nodename" in error_msg or "not known" in error_msg:
-                raise LLMError(
-                    "网络连接错误：无法解析服务器地址。请检查网络连接和DNS设置。"
-                ) from exc
-            raise LLMError(f"连接错误：无法连接到AI服务。请检查网络连接。") from exc
-        except httpx.HTTPStatusError as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Qwen API HTTP error {exc.response.status_code}")
-            raise LLMError(f"HTTP错误 {exc.response.status_code}：{exc.response.text[:200]}") from exc
-        except Exception as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Qwen API error after {request_time:.2f}s: {str(exc)}", exc_info=True)
-            error_msg = str(exc)
-            if "nodename" in error_msg or "not known" in error_msg or "getaddrinfo" in error_msg:
-                raise LLMError(
-                    "网络连接错误：无法解析服务器地址。请检查网络连接和DNS设置。"
-                ) from exc
-            raise LLMError(f"API错误：{error_msg}") from exc
-
-    def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
+    async def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
         """Make streaming HTTP request to DashScope API."""
-        import logging
-        import time
-
-        logger = logging.getLogger(__name__)
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        base_url = self._get_base_url()
-        url = f"{base_url}/{endpoint}"
+        headers = self._get_headers()
+        url = self._get_url(endpoint)
 
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
+        timeout = self._get_timeout()
 
         # Enable streaming
         payload = payload.copy()
         payload["stream"] = True
 
-        logger.debug(f"Qwen streaming request - URL: {url}, Model: {payload.get('model', 'unknown')}")
+        logger.debug("Qwen streaming request - URL: %s, Model: %s", url, payload.get('model', 'unknown'))
 
         try:
-            with httpx.Client(timeout=timeout) as client:
-                with client.stream("POST", url, json=payload, headers=headers) as response:
-                    response.raise_for_status()
-                    for line in response.iter_lines():
-                        if line:
-                            if line.startswith("data: "):
-                                data_str = line[6:]  # Remove "data: " prefix
-                                if data_str == "[DONE]":
-                                    break
-                                try:
-                                    import json
-                                    chunk_data = json.loads(data_str)
-                                    content = self._extract_stream_chunk(chunk_data)
-                                    if content:
-                                        yield content
-                                except json.JSONDecodeError:
-                                    continue
-                                except Exception as e:
-                                    logger.warning(f"Error parsing stream chunk: {e}")
-                                    continue
+            async for content in self._stream(url, payload, headers, timeout, sse=True):
+                yield content
         except httpx.TimeoutException as exc:
-            logger.error(f"Qwen streaming timeout: {str(exc)}")
+            logger.error("Qwen streaming timeout: %s", exc)
             raise LLMError(f"请求超时：流式响应时间超过限制。") from exc
         except httpx.ConnectError as exc:
-            logger.error(f"Qwen streaming connection error: {str(exc)}")
+            logger.error("Qwen streaming connection error: %s", exc)
             error_msg = str(exc)
             if "nodename" in error_msg or "not known" in error_msg:
                 raise LLMError(
@@ -224,10 +315,10 @@ class QwenClient(BaseLLMClient):
                 ) from exc
             raise LLMError(f"连接错误：无法连接到AI服务。请检查网络连接。") from exc
         except httpx.HTTPStatusError as exc:
-            logger.error(f"Qwen streaming HTTP error {exc.response.status_code}: {str(exc)}")
-            raise LLMError(f"HTTP错误 {exc.response.status_code}：{exc.response.text[:200]}") from exc
+            logger.error("Qwen streaming HTTP error %s: %s", exc.response.status_code, exc)
+            raise LLMError(f"HTTP错误 {exc.response.status_code}：{_error_snippet(exc.response)}") from exc
         except Exception as exc:
-            logger.error(f"Qwen streaming error: {str(exc)}", exc_info=True)
+            logger.error("Qwen streaming error: %s", exc, exc_info=True)
             error_msg = str(exc)
             if "nodename" in error_msg or "not known" in error_msg or "getaddrinfo" in error_msg:
                 raise LLMError(
@@ -247,12 +338,18 @@ class QwenClient(BaseLLMClient):
 class AzureOpenAIClient(BaseLLMClient):
     """Azure OpenAI LLM client."""
 
+    __slots__ = ("_api_version", "_proxy")
+
+    def __init__(self, api_key: Optional[str] = None, config=None):
+        super().__init__(api_key=api_key, config=config)
+        self._api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
+        # Resolved lazily: reading the endpoint raises when AZURE_OPENAI_ENDPOINT is unset
+        self._proxy: Optional[bool] = None
+
     def _get_api_key(self) -> Optional[str]:
-        import os
         return os.getenv("AZURE_OPENAI_API_KEY")
 
     def _get_base_url(self) -> str:
-        import os
         base_url = os.getenv("AZURE_OPENAI_ENDPOINT")
         if not base_url:
             raise ValueError(
@@ -262,12 +359,30 @@ class AzureOpenAIClient(BaseLLMClient):
         # Azure OpenAI uses different endpoint format
         return base_url.rstrip("/")
     
+    def _build_headers(self) -> Dict[str, str]:
+        """Build headers for Azure OpenAI or an OpenAI-compatible proxy."""
+        if self._is_proxy_server():
+            return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        return {"api-key": self.api_key, "Content-Type": "application/json"}
+
+    def _build_url(self, deployment_name: str) -> str:
+        """Build chat completions URL; Azure URLs are keyed by deployment rather than endpoint."""
+        base_url = self._get_base_url()
+        if self._is_proxy_server():
+            # OpenAI format: base_url should include /v1, endpoint is /chat/completions
+            if base_url.endswith("/v1"):
+                return f"{base_url}/chat/completions"
+            return f"{base_url}/v1/chat/completions"
+        api_version = self._api_version
+        # Azure OpenAI endpoint format: /openai/deployments/{deployment}/chat/completions?api-version={version}
+        return f"{base_url}/openai/deployments/{deployment_name}/chat/completions?api-version={api_version}"
+
     def _is_proxy_server(self) -> bool:
         """Check if using a proxy server that requires OpenAI-compatible format."""
-        base_url = self._get_base_url()
-        # Common proxy server indicators
-        proxy_indicators = ["gptsapi.net", "proxy", "openrouter", "together", "anyscale"]
-        return any(indicator in base_url.lower() for indicator in proxy_indicators)
+        if self._proxy is None:
+            base_url = self._get_base_url().lower()
+            self._proxy = any(indicator in base_url for indicator in _PROXY_INDICATORS)
+        return self._proxy
 
     def _get_model_name(self) -> str:
         # Azure OpenAI model name from config
@@ -276,9 +391,8 @@ class AzureOpenAIClient(BaseLLMClient):
 
     def _normalize_payload(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> Dict[str, Any]:
         """Normalize payload for Azure OpenAI API or OpenAI-compatible proxy."""
-        import os
         # Azure OpenAI uses deployment name, which might be different from model name
-        deployment_name = model or self._get_model_name()
+        deployment_name = model or self._model
         
         # For proxy servers using OpenAI format, model should be in payload
         if self._is_proxy_server():
@@ -292,194 +406,36 @@ class AzureOpenAIClient(BaseLLMClient):
                 "messages": messages,
             }
 
-    def _extract_response(self, data: Dict[str, Any]) -> str:
-        """Extract response from Azure OpenAI format."""
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "未能获取模型回复。")
-
-    def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make HTTP request to Azure OpenAI API."""
-        import logging
-        import os
-        import time
-
-        logger = logging.getLogger(__name__)
-        
-        base_url = self._get_base_url()
-        is_proxy = self._is_proxy_server()
-        
-        if is_proxy:
-            # OpenAI-compatible proxy server format
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            # OpenAI format: base_url should include /v1, endpoint is /chat/completions
-            if base_url.endswith("/v1"):
-                url = f"{base_url}/chat/completions"
-            elif base_url.endswith("/v1/"):
-                url = f"{base_url}chat/completions"
-            else:
-                url = f"{base_url}/v1/chat/completions"
-            deployment_name = payload.get("model", self._get_model_name())
-            request_payload = payload  # Keep model in payload for OpenAI format
-        else:
-            # Azure OpenAI format
-            headers = {
-                "api-key": self.api_key,
-                "Content-Type": "application/json"
-            }
-            deployment_name = payload.get("model", self._get_model_name())
-            api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
-            # Azure OpenAI endpoint format: /openai/deployments/{deployment}/chat/completions?api-version={version}
-            url = f"{base_url}/openai/deployments/{deployment_name}/chat/completions?api-version={api_version}"
-            # Remove model from payload for Azure OpenAI (it's in the URL)
-            request_payload = {k: v for k, v in payload.items() if k != "model"}
-
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
-
-        messages_count = len(payload.get("messages", []))
-        format_type = "OpenAI兼容" if is_proxy else "Azure OpenAI"
-        logger.info(f"Azure OpenAI API request ({format_type}) - URL: {url}, Model: {deployment_name}, Messages: {messages_count}")
-
-        request_start = time.time()
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(url, json=request_payload, headers=headers)
-                request_time = time.time() - request_start
-
-                logger.debug(f"Azure OpenAI API response - Status: {response.status_code}, Time: {request_time:.2f}s")
-                response.raise_for_status()
-
-                result = response.json()
-                logger.debug(f"Azure OpenAI response parsed successfully")
-                return result
-
-        except httpx.TimeoutException as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Azure OpenAI API timeout after {request_time:.2f}s")
-            raise LLMError(f"请求超时：API响应时间超过 {self._config.llm_timeout} 秒。") from exc
-        except httpx.HTTPStatusError as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Azure OpenAI API HTTP error {exc.response.status_code}")
-            error_text = exc.response.text[:200] if exc.response.text else ""
-            if exc.response.status_code == 404:
-                # Check if using proxy server
-                is_proxy = "gptsapi.net" in base_url or "proxy" in base_url.lower()
-                if is_proxy:
-                    raise LLMError(
-                        f"部署名称 '{deployment_name}' 在代理服务器上不存在（404错误）。\n"
-                        f"可能的原因：\n"
-                        f"1. 部署名称不正确 - 请检查代理服务器文档确认正确的模型名称\n"
-                        f"2. API版本不匹配 - 当前使用: {api_version}，可能需要: 2024-02-15-preview 或其他版本\n"
-                        f"3. 端点格式不同 - 代理服务器可能使用不同的URL格式\n"
-                        f"建议：\n"
-                        f"- 尝试设置环境变量 AZURE_OPENAI_API_VERSION=2024-02-15-preview\n"
-                        f"- 联系代理服务提供商确认正确的部署名称和API版本\n"
-                        f"- 当前请求URL: {url}"
-                    ) from exc
-                else:
-                    raise LLMError(
-                        f"Azure OpenAI 部署 '{deployment_name}' 不存在或无法访问。"
-                        f"请检查Azure门户中的部署名称是否正确。"
-                    ) from exc
-            raise LLMError(f"HTTP错误 {exc.response.status_code}：{error_text}") from exc
-        except Exception as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Azure OpenAI API error after {request_time:.2f}s: {str(exc)}")
-            raise LLMError(f"API错误：{str(exc)}") from exc
-
-    def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
+    async def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
         """Make streaming HTTP request to Azure OpenAI API."""
-        import logging
-        import os
-        import socket
-
-        logger = logging.getLogger(__name__)
-        
-        base_url = self._get_base_url()
         is_proxy = self._is_proxy_server()
-        
+        deployment_name = payload.get("model", self._model)
+        headers = self._get_headers()
+        url = self._get_url(deployment_name)
+        api_version = self._api_version
+
         if is_proxy:
-            # OpenAI-compatible proxy server format
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            # OpenAI format: base_url should include /v1, endpoint is /chat/completions
-            if base_url.endswith("/v1"):
-                url = f"{base_url}/chat/completions"
-            elif base_url.endswith("/v1/"):
-                url = f"{base_url}chat/completions"
-            else:
-                url = f"{base_url}/v1/chat/completions"
-            deployment_name = payload.get("model", self._get_model_name())
             request_payload = payload.copy()  # Keep model in payload for OpenAI format
             request_payload["stream"] = True
         else:
-            # Azure OpenAI format
-            headers = {
-                "api-key": self.api_key,
-                "Content-Type": "application/json"
-            }
-            deployment_name = payload.get("model", self._get_model_name())
-            api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
-            # Azure OpenAI endpoint format: /openai/deployments/{deployment}/chat/completions?api-version={version}
-            url = f"{base_url}/openai/deployments/{deployment_name}/chat/completions?api-version={api_version}"
             # Remove model from payload for Azure OpenAI (it's in the URL)
-            request_payload = {k: v for k, v in payload.items() if k != "model"}
+            request_payload = dict(payload)
+            request_payload.pop("model", None)
             request_payload["stream"] = True
 
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
+        timeout = self._get_timeout()
 
         format_type = "OpenAI兼容" if is_proxy else "Azure OpenAI"
-        logger.info(f"Azure OpenAI streaming request ({format_type}) - URL: {url}, Model: {deployment_name}")
+        logger.info("Azure OpenAI streaming request (%s) - URL: %s, Model: %s", format_type, url, deployment_name)
 
         try:
-            with httpx.Client(timeout=timeout) as client:
-                with client.stream("POST", url, json=request_payload, headers=headers) as response:
-                    # Check status before processing stream
-                    if response.status_code != 200:
-                        # Read error response
-                        error_text = ""
-                        try:
-                            error_text = response.read().decode('utf-8', errors='ignore')[:500]
-                        except:
-                            pass
-                        logger.error(f"Azure OpenAI streaming error response (status {response.status_code}): {error_text}")
-                        response.raise_for_status()
-                    response.raise_for_status()
-                    for line in response.iter_lines():
-                        if line:
-                            if line.startswith("data: "):
-                                data_str = line[6:]  # Remove "data: " prefix
-                                if data_str == "[DONE]":
-                                    break
-                                try:
-                                    import json
-                                    chunk_data = json.loads(data_str)
-                                    content = self._extract_stream_chunk(chunk_data)
-                                    if content:
-                                        yield content
-                                except json.JSONDecodeError:
-                                    continue
-                                except Exception as e:
-                                    logger.warning(f"Error parsing stream chunk: {e}")
-                                    continue
+            async for content in self._stream(url, request_payload, headers, timeout, sse=True):
+                yield content
         except httpx.TimeoutException as exc:
-            logger.error(f"Azure OpenAI streaming timeout: {str(exc)}")
+            logger.error("Azure OpenAI streaming timeout: %s", exc)
             raise LLMError(f"请求超时：流式响应时间超过限制。请检查网络连接或稍后重试。") from exc
         except httpx.ConnectError as exc:
-            logger.error(f"Azure OpenAI streaming connection error: {str(exc)}")
+            logger.error("Azure OpenAI streaming connection error: %s", exc)
             error_msg = str(exc)
             if "10054" in error_msg or "远程主机强迫关闭" in error_msg or "Connection reset" in error_msg:
                 raise LLMError(
@@ -492,11 +448,9 @@ class AzureOpenAIClient(BaseLLMClient):
                 ) from exc
             raise LLMError(f"连接错误：无法连接到Azure OpenAI服务。请检查网络连接和端点配置。") from exc
         except httpx.HTTPStatusError as exc:
-            logger.error(f"Azure OpenAI streaming HTTP error {exc.response.status_code}: {str(exc)}")
-            error_text = exc.response.text[:200] if exc.response.text else ""
+            logger.error("Azure OpenAI streaming HTTP error %s: %s", exc.response.status_code, exc)
+            error_text = _error_snippet(exc.response)
             if exc.response.status_code == 404:
-                # Check if using proxy server
-                is_proxy = "gptsapi.net" in base_url or "proxy" in base_url.lower()
                 if is_proxy:
                     raise LLMError(
                         f"部署名称 '{deployment_name}' 在代理服务器上不存在（404错误）。\n"
@@ -517,7 +471,7 @@ class AzureOpenAIClient(BaseLLMClient):
                     ) from exc
             raise LLMError(f"HTTP错误 {exc.response.status_code}：{error_text}") from exc
         except socket.error as exc:
-            logger.error(f"Azure OpenAI streaming socket error: {str(exc)}")
+            logger.error("Azure OpenAI streaming socket error: %s", exc)
             error_code = getattr(exc, 'winerror', None) or getattr(exc, 'errno', None)
             if error_code == 10054 or "10054" in str(exc) or "远程主机强迫关闭" in str(exc):
                 raise LLMError(
@@ -526,7 +480,7 @@ class AzureOpenAIClient(BaseLLMClient):
                 ) from exc
             raise LLMError(f"网络连接错误：{str(exc)}。请检查网络连接。") from exc
         except Exception as exc:
-            logger.error(f"Azure OpenAI streaming error: {str(exc)}", exc_info=True)
+            logger.error("Azure OpenAI streaming error: %s", exc, exc_info=True)
             error_msg = str(exc)
             # Check for Windows socket error 10054
             if "10054" in error_msg or "远程主机强迫关闭" in error_msg or "Connection reset" in error_msg:
@@ -552,19 +506,36 @@ class AzureOpenAIClient(BaseLLMClient):
 class OllamaClient(BaseLLMClient):
     """Ollama LLM client supporting any Ollama model."""
 
+    __slots__ = ()
+
+    # Ollama is usually local and does not decode compressed request bodies
+    supports_gzip_requests = False
+
     def _get_api_key(self) -> Optional[str]:
         """Ollama typically doesn't require API key, but can be configured."""
-        import os
         return os.getenv("OLLAMA_API_KEY")  # Optional, usually None
 
-    @property
-    def has_api_key(self) -> bool:
-        """Ollama doesn't require API key, so always return True."""
-        return True
+    def __init__(self, api_key: Optional[str] = None, config=None):
+        super().__init__(api_key=api_key, config=config)
+        # Ollama doesn't require API key, so the client is always usable
+        self.has_api_key = True
+
+    def _build_headers(self) -> Dict[str, str]:
+        """Build headers; Ollama only needs Authorization when an API key is configured."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _build_url(self, endpoint: str) -> str:
+        """Build request URL, mapping chat/completions to the native /api/chat endpoint."""
+        base_url = self._get_base_url()
+        if endpoint == "chat/completions":
+            return f"{base_url}/api/chat"
+        return f"{base_url}/{endpoint}"
 
     def _get_base_url(self) -> str:
         """Get Ollama base URL from environment or use default."""
-        import os
         base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         return base_url.rstrip("/")
 
@@ -579,174 +550,33 @@ class OllamaClient(BaseLLMClient):
         # Convert messages to Ollama format
         # Ollama uses a simple messages array format
         return {
-            "model": model or self._get_model_name(),
+            "model": model or self._model,
             "messages": messages,
         }
 
-    def _extract_response(self, data: Dict[str, Any]) -> str:
-        """Extract response from Ollama native API format."""
-        # Ollama native API returns: {"message": {"content": "...", "role": "assistant"}, ...}
-        message = data.get("message", {})
-        if message:
-            return message.get("content", "未能获取模型回复。")
-        # Fallback to OpenAI-compatible format if available
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "未能获取模型回复。")
-
-    def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make HTTP request to Ollama API."""
-        import logging
-        import time
-
-        logger = logging.getLogger(__name__)
-        headers = {"Content-Type": "application/json"}
-        
-        # Add API key to headers if available
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        
-        base_url = self._get_base_url()
-        # Use Ollama native API endpoint
-        if endpoint == "chat/completions":
-            url = f"{base_url}/api/chat"
-        else:
-            url = f"{base_url}/{endpoint}"
-
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
-
-        model = payload.get("model", "unknown")
-        messages_count = len(payload.get("messages", []))
-        logger.debug(f"Ollama API request - URL: {url}, Model: {model}, Messages: {messages_count}")
-        logger.debug(f"Ollama API request payload: {payload}")
-
-        request_start = time.time()
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(url, json=payload, headers=headers)
-                request_time = time.time() - request_start
-
-                logger.debug(f"Ollama API response - Status: {response.status_code}, Time: {request_time:.2f}s")
-                if response.status_code != 200:
-                    error_text = response.text[:500] if response.text else ""
-                    logger.error(f"Ollama API error response: {error_text}")
-                response.raise_for_status()
-
-                result = response.json()
-                logger.debug(f"Ollama response parsed successfully - Size: {len(str(result))} chars")
-                return result
-
-        except httpx.TimeoutException as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Ollama API timeout after {request_time:.2f}s")
-            raise LLMError(f"请求超时：API响应时间超过 {self._config.llm_timeout} 秒。") from exc
-        except httpx.ConnectError as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Ollama API connection error after {request_time:.2f}s: {str(exc)}")
-            error_msg = str(exc)
-            if "nodename" in error_msg or "not known" in error_msg:
-                raise LLMError(
-                    "网络连接错误：无法解析服务器地址。请检查网络连接和DNS设置，确保Ollama服务正在运行。"
-                ) from exc
-            if "Connection refused" in error_msg or "refused" in error_msg:
-                raise LLMError(
-                    "连接被拒绝：无法连接到Ollama服务。请确保Ollama服务正在运行（默认地址：http://localhost:11434）。"
-                ) from exc
-            raise LLMError(f"连接错误：无法连接到Ollama服务。请检查网络连接和Ollama服务状态。") from exc
-        except httpx.HTTPStatusError as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Ollama API HTTP error {exc.response.status_code}")
-            error_text = exc.response.text[:200] if exc.response.text else ""
-            model_name = payload.get("model", "unknown")
-            if exc.response.status_code == 404:
-                raise LLMError(
-                    f"模型 '{model_name}' 不存在或无法访问。"
-                    f"请确保模型已正确安装（使用 'ollama pull {model_name}'），"
-                    f"或检查 config.yaml 中的模型名称是否正确。"
-                ) from exc
-            raise LLMError(f"HTTP错误 {exc.response.status_code}：{error_text}") from exc
-        except Exception as exc:
-            request_time = time.time() - request_start
-            logger.error(f"Ollama API error after {request_time:.2f}s: {str(exc)}", exc_info=True)
-            error_msg = str(exc)
-            if "nodename" in error_msg or "not known" in error_msg or "getaddrinfo" in error_msg:
-                raise LLMError(
-                    "网络连接错误：无法解析服务器地址。请检查网络连接和DNS设置。"
-                ) from exc
-            raise LLMError(f"API错误：{error_msg}") from exc
-
-    def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
+    async def _make_stream_request(self, endpoint: str, payload: Dict[str, Any]):
         """Make streaming HTTP request to Ollama API."""
-        import logging
-        import time
+        headers = self._get_headers()
+        url = self._get_url(endpoint)
 
-        logger = logging.getLogger(__name__)
-        headers = {"Content-Type": "application/json"}
-        
-        # Add API key to headers if available
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        
-        base_url = self._get_base_url()
-        # Use Ollama native API endpoint
-        if endpoint == "chat/completions":
-            url = f"{base_url}/api/chat"
-        else:
-            url = f"{base_url}/{endpoint}"
-
-        timeout = httpx.Timeout(
-            connect=30.0,
-            read=self._config.llm_timeout,
-            write=30.0,
-            pool=30.0
-        )
+        timeout = self._get_timeout()
 
         # Enable streaming
         payload = payload.copy()
         payload["stream"] = True
 
-        logger.debug(f"Ollama streaming request - URL: {url}, Model: {payload.get('model', 'unknown')}")
-        logger.debug(f"Ollama streaming request payload: {payload}")
+        logger.debug("Ollama streaming request - URL: %s, Model: %s", url, payload.get('model', 'unknown'))
+        logger.debug("Ollama streaming request payload: %s", payload)
 
         try:
-            with httpx.Client(timeout=timeout) as client:
-                with client.stream("POST", url, json=payload, headers=headers) as response:
-                    # Check status before processing stream
-                    if response.status_code != 200:
-                        # Read error response
-                        error_text = ""
-                        try:
-                            error_text = response.read().decode('utf-8', errors='ignore')[:500]
-                        except:
-                            pass
-                        logger.error(f"Ollama streaming error response (status {response.status_code}): {error_text}")
-                        response.raise_for_status()
-                    response.raise_for_status()
-                    # Ollama native API returns JSON lines (one JSON object per line)
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                import json
-                                chunk_data = json.loads(line)
-                                # Check if this is the final chunk
-                                if chunk_data.get("done", False):
-                                    break
-                                content = self._extract_stream_chunk(chunk_data)
-                                if content:
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
-                            except Exception as e:
-                                logger.warning(f"Error parsing stream chunk: {e}")
-                                continue
+            # Ollama native API returns JSON lines (one JSON object per line)
+            async for content in self._stream(url, payload, headers, timeout, sse=False):
+                yield content
         except httpx.TimeoutException as exc:
-            logger.error(f"Ollama streaming timeout: {str(exc)}")
+            logger.error("Ollama streaming timeout: %s", exc)
             raise LLMError(f"请求超时：流式响应时间超过限制。") from exc
         except httpx.ConnectError as exc:
-            logger.error(f"Ollama streaming connection error: {str(exc)}")
+            logger.error("Ollama streaming connection error: %s", exc)
             error_msg = str(exc)
             if "nodename" in error_msg or "not known" in error_msg:
                 raise LLMError(
@@ -758,8 +588,8 @@ class OllamaClient(BaseLLMClient):
                 ) from exc
             raise LLMError(f"连接错误：无法连接到Ollama服务。请检查网络连接和Ollama服务状态。") from exc
         except httpx.HTTPStatusError as exc:
-            logger.error(f"Ollama streaming HTTP error {exc.response.status_code}: {str(exc)}")
-            error_text = exc.response.text[:200] if exc.response.text else ""
+            logger.error("Ollama streaming HTTP error %s: %s", exc.response.status_code, exc)
+            error_text = _error_snippet(exc.response)
             model_name = payload.get("model", "unknown")
             if exc.response.status_code == 404:
                 raise LLMError(
@@ -769,7 +599,7 @@ class OllamaClient(BaseLLMClient):
                 ) from exc
             raise LLMError(f"HTTP错误 {exc.response.status_code}：{error_text}") from exc
         except Exception as exc:
-            logger.error(f"Ollama streaming error: {str(exc)}", exc_info=True)
+            logger.error("Ollama streaming error: %s", exc, exc_info=True)
             error_msg = str(exc)
             if "nodename" in error_msg or "not known" in error_msg or "getaddrinfo" in error_msg:
                 raise LLMError(
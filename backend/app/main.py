@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Ensure backend directory is in sys.path for imports
 _backend_dir = Path(__file__).parent.parent
@@ -26,7 +30,9 @@ from app.api import (
 )
 from app.logger import setup_logging
 from app.llm import LLMClient
+from app.llm.http import close_shared_client
 from app.service.chat import ChatService
+from app.service.file_parser import shutdown_parse_pool
 from app.service.review import ReviewService
 
 # Configure logging to output to both console and file
@@ -44,7 +50,26 @@ setup_logging(
 
 load_dotenv()
 
-app = FastAPI(title="MRT Review Agent", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: keep LLM connections warm while running, release resources on shutdown."""
+    keep_warm_task = asyncio.create_task(llm_client.keep_warm())
+    yield
+    keep_warm_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await keep_warm_task
+    await close_shared_client()
+    shutdown_parse_pool()
+
+
+# orjson serializes JSON responses straight to UTF-8 bytes, several times faster than stdlib json
+app = FastAPI(
+    title="MRT Review Agent",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS configuration
 # Allow origins from environment variable, or default to allow all origins
@@ -87,11 +112,24 @@ def main():
     # 使用导入字符串以支持 reload 功能
     # Use DEBUG level if LOG_LEVEL env var is set to DEBUG
     uvicorn_log_level = "debug" if os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG" else "info"
+    # UVICORN_RELOAD=false selects the production path: no reloader, WEB_CONCURRENCY workers,
+    # no per-request access log and no Server/Date headers
+    reload = os.getenv("UVICORN_RELOAD", "true").lower() in ("1", "true", "yes")
+    # uvloop/httptools come from uvicorn[standard], which doesn't install uvloop on Windows, so dev
+    # runs keep uvicorn's auto-detection and only production pins them
+    pin_fast_loop = not reload and sys.platform != "win32"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop" if pin_fast_loop else "auto",
+        http="httptools" if pin_fast_loop else "auto",
+        access_log=reload,
+        server_header=reload,
+        date_header=reload,
+        proxy_headers=True,
         log_level=uvicorn_log_level
     )
 
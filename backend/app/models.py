@@ -2,20 +2,30 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Models are immutable once validated: checklists and constant responses are cached and shared
+# across requests, so they must not be mutated in place
+_FROZEN = ConfigDict(frozen=True)
 
 
 class ChecklistItem(BaseModel):
+    model_config = _FROZEN
+
     id: str = Field(..., description="Checklist identifier")
     description: str = Field(..., description="Description of the checklist item")
 
 
 class Suggestion(BaseModel):
+    model_config = _FROZEN
+
     checklist_id: str = Field(..., description="Checklist identifier the suggestion refers to")
     message: str = Field(..., description="Suggested improvement text")
 
 
 class ReviewRequest(BaseModel):
+    model_config = _FROZEN
+
     mrt_content: str = Field(..., description="Raw manual regression test content provided by the user")
     software_requirement: Optional[str] = Field(
         default=None,
@@ -32,12 +42,23 @@ class ReviewRequest(BaseModel):
 
 
 class ReviewResponse(BaseModel):
+    model_config = _FROZEN
+
     suggestions: List[Suggestion] = Field(..., description="List of suggestions derived from the review")
     summary: Optional[str] = Field(default=None, description="Optional overall summary of the review")
     raw_content: Optional[str] = Field(default=None, description="Raw content output from the model")
 
 
+class FileAttachment(BaseModel):
+    model_config = _FROZEN
+
+    name: str = Field(default="untitled", description="Original file name")
+    content: str = Field(default="", description="Extracted text, or a [BINARY_FILE:...] marker for unparsed files")
+
+
 class ChatRequest(BaseModel):
+    model_config = _FROZEN
+
     session_id: Optional[str] = Field(
         default=None,
         description="Existing session identifier. Leave empty to start a new session.",
@@ -62,12 +83,14 @@ class ChatRequest(BaseModel):
         default=None,
         description="Optional custom checklist provided outside of the conversational message.",
     )
-    files: Optional[List[Dict[str, str]]] = Field(
+    files: Optional[List[FileAttachment]] = Field(
         default=None,
         description="List of uploaded files with name and content. Format: [{'name': '...', 'content': '...'}, ...]",
     )
 
 
 class ConfigUpdateRequest(BaseModel):
+    model_config = _FROZEN
+
     system_prompt_template: str = Field(..., description="System prompt template to save")
     checklist: List[ChecklistItem] = Field(..., description="Checklist items to save")
@@ -1,12 +1,13 @@
 """Chat service for conversational MRT review agent."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Dict, Generator, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional
 
 from ..config import get_config
 from ..llm import LLMClient, LLMError
-from ..models import ChatRequest
+from ..models import ChatRequest, ChecklistItem
 from ..utils.constants import MAX_CONVERSATION_TURNS
 from ..utils.exceptions import format_error_message
 from .chat_file_handler import format_files_for_message
@@ -17,6 +18,14 @@ logger = logging.getLogger(__name__)
 class ChatService:
     """Service for conversational MRT review agent based on conversation history."""
 
+    __slots__ = ("llm_client",)
+
+    _WELCOME_MESSAGE = (
+        "Hello! I'm a professional MRT (Manual Regression Test) review assistant. "
+        "I can help you review test cases according to a checklist. "
+        "Please upload MRT files or paste test case content to get started."
+    )
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
         """Initialize chat service."""
         self.llm_client = llm_client or LLMClient()
@@ -24,7 +33,12 @@ class ChatService:
     def _build_agent_system_prompt(self) -> str:
         """Build unified system prompt for MRT review agent."""
         config = get_config()
-        checklist = config.default_checklist
+        # The prompt only depends on the checklist, so render it once per config
+        return config.cached("agent_system_prompt", lambda: self._render_agent_system_prompt(config.default_checklist))
+
+    @staticmethod
+    def _render_agent_system_prompt(checklist: List[ChecklistItem]) -> str:
+        """Render the agent system prompt for a checklist."""
         checklist_string = "\n".join([f"- {item.id}: {item.description}" for item in checklist])
 
         return f"""You are a professional MRT (Manual Regression Test) review assistant. Your goal is to review MRT test cases.
@@ -56,12 +70,12 @@ Answer user questions about the review process."""
         if len(messages) <= max_turns:
             return messages
 
-        # Keep system message if exists, then recent messages
+        # Keep system message if exists, then recent messages; slicing copies only the kept references
         if messages and messages[0].get("role") == "system":
             return [messages[0]] + messages[-(max_turns - 1):]
         return messages[-max_turns:]
 
-    def chat_stream(self, request: ChatRequest) -> Generator[str, None, None]:
+    async def chat_stream(self, request: ChatRequest) -> AsyncGenerator[str, None]:
         """
         Handle chat request with streaming response.
         
@@ -69,8 +83,9 @@ Answer user questions about the review process."""
         and streams LLM responses. All context is maintained in conversation history.
         """
         try:
-            # Handle file uploads - format as part of user message
-            file_content = format_files_for_message(request.files)
+            # Handle file uploads - format as part of user message; decoding, hashing and parsing
+            # attachments is blocking work, so it runs in a worker thread off the event loop
+            file_content = await asyncio.to_thread(format_files_for_message, request.files) if request.files else ""
             
             # Build user message
             user_message = request.message or ""
@@ -80,8 +95,8 @@ Answer user questions about the review process."""
                 else:
                     user_message = file_content
 
-            # Get conversation history from request
-            messages = request.messages or []
+            # Get conversation history from request; copied so the request model is never modified
+            messages = list(request.messages or [])
             
             # Add current user message to history
             if user_message:
@@ -96,18 +111,18 @@ Answer user questions about the review process."""
             # Stream LLM response
             if messages:
                 try:
-                    for chunk in self.llm_client.chat_stream(messages, system_prompt=system_prompt):
+                    async for chunk in self.llm_client.chat_stream(messages, system_prompt=system_prompt):
                         yield chunk
                 except LLMError as exc:
                     error_msg = format_error_message(exc, "Error processing request")
                     yield error_msg
                 except Exception as exc:
-                    logger.error(f"Unexpected error during LLM streaming: {exc}", exc_info=True)
+                    logger.error("Unexpected error during LLM streaming: %s", exc, exc_info=True)
                     yield f"An unexpected error occurred: {str(exc)}"
             else:
                 # No messages yet, return welcome message
-                yield "Hello! I'm a professional MRT (Manual Regression Test) review assistant. I can help you review test cases according to a checklist. Please upload MRT files or paste test case content to get started."
+                yield self._WELCOME_MESSAGE
 
         except Exception as exc:
-            logger.error(f"Error in chat_stream: {exc}", exc_info=True)
+            logger.error("Error in chat_stream: %s", exc, exc_info=True)
             yield f"An error occurred while processing your request: {str(exc)}"
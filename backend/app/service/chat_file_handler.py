@@ -2,21 +2,28 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
+from typing import List, Optional
 
+from ..models import FileAttachment
 from ..utils.constants import MAX_FILE_CONTENT_SIZE, MAX_TOTAL_FILE_SIZE
-from ..utils.file_utils import is_binary_file, truncate_content
+from ..utils.file_utils import is_binary_file, truncation_note
 from .file_parser import parse_file_content
 
 logger = logging.getLogger(__name__)
 
+_UNPARSED_BINARY_NOTE = (
+    "[Note: This is a binary file that could not be parsed. "
+    "Please paste the file content as text or use a text format file.]\n"
+)
+_SIZE_LIMIT_NOTE = "\n\n[Note: Remaining file content omitted due to size limit]"
 
-def format_files_for_message(files: Optional[List[Dict[str, str]]]) -> str:
+
+def format_files_for_message(files: Optional[List[FileAttachment]]) -> str:
     """
     Handle file uploads and format them for user message in conversation history.
     
     Args:
-        files: List of file dictionaries with 'name' and 'content' keys
+        files: List of attached files with name and content
         
     Returns:
         Formatted file content string to be added to user message.
@@ -25,54 +32,71 @@ def format_files_for_message(files: Optional[List[Dict[str, str]]]) -> str:
     if not files:
         return ""
 
-    file_parts = []
+    # Headers, contents and separators are collected as separate pieces and joined once, so
+    # large file contents are copied only into the final string
+    pieces: List[str] = []
+    # Running size of the formatted files, so the size limit check doesn't re-sum every part per file
+    current_total = 0
 
     for file_info in files:
-        file_name = file_info.get("name", "untitled")
-        file_content = file_info.get("content", "")
+        file_name = file_info.name
+        file_content = file_info.content
         if not file_content:
             continue
 
         # Parse file content
         parsed_content = None
-        if is_binary_file(file_content):
+        is_binary = is_binary_file(file_content)
+        if is_binary:
             # Try to parse binary file
             try:
                 parsed_content = parse_file_content(file_name, file_content)
             except Exception as e:
-                logger.warning(f"Failed to parse binary file {file_name}: {e}")
+                logger.warning("Failed to parse binary file %s: %s", file_name, e)
 
         if parsed_content is None:
             # Handle text files or failed binary parsing
-            if not is_binary_file(file_content):
+            if not is_binary:
                 parsed_content = file_content
             else:
                 # Binary file that couldn't be parsed
-                file_parts.append(
-                    f"[File: {file_name}]\n"
-                    f"[Note: This is a binary file that could not be parsed. "
-                    f"Please paste the file content as text or use a text format file.]\n"
-                )
+                header = f"[File: {file_name}]\n"
+                _append_part(pieces, header, _UNPARSED_BINARY_NOTE)
+                current_total += len(header) + len(_UNPARSED_BINARY_NOTE)
                 continue
 
-        # Truncate if too long
-        parsed_content = truncate_content(parsed_content, MAX_FILE_CONTENT_SIZE, file_name)
+        # Slice each file once instead of truncating it to the per-file limit and then again to the
+        # total limit; truncation notes are separate pieces so the kept content isn't copied to append them
+        header = f"[File: {file_name}]\n"
+        content_size = len(parsed_content)
+        kept_size = min(content_size, MAX_FILE_CONTENT_SIZE)
+        note = truncation_note(content_size, file_name) if kept_size < content_size else ""
+        formatted_size = kept_size + len(note)
 
         # Check total size
-        current_total = sum(len(part) for part in file_parts)
-        if current_total + len(parsed_content) > MAX_TOTAL_FILE_SIZE:
+        if current_total + formatted_size > MAX_TOTAL_FILE_SIZE:
             remaining = MAX_TOTAL_FILE_SIZE - current_total
             if remaining > 0:
-                truncated = truncate_content(parsed_content, remaining, file_name)
-                file_parts.append(
-                    f"[File: {file_name}]\n{truncated}\n\n"
-                    f"[Note: Remaining file content omitted due to size limit]"
+                # Same cut as truncating the formatted content (kept content plus its note) to the budget
+                _append_part(
+                    pieces,
+                    header,
+                    parsed_content[:min(remaining, kept_size)],
+                    note[:max(0, remaining - kept_size)],
+                    truncation_note(formatted_size, file_name),
+                    _SIZE_LIMIT_NOTE,
                 )
             break
 
-        file_parts.append(f"[File: {file_name}]\n{parsed_content}")
+        _append_part(pieces, header, parsed_content[:kept_size] if note else parsed_content, note)
+        current_total += len(header) + formatted_size
+
+    return "".join(pieces)
+
 
-    if file_parts:
-        return "\n\n".join(file_parts)
-    return ""
+def _append_part(pieces: List[str], *part: str) -> None:
+    """Add one file's pieces, separated from the previous file by a blank line."""
+    if pieces:
+        pieces.append("\n\n")
+    pieces.extend(part)
 
@@ -1,10 +1,23 @@
 """File parsing utilities for PDF, Word, and text files."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import importlib
 import logging
-from typing import Optional
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from io import BytesIO
+from types import ModuleType
+from typing import BinaryIO, Optional, Tuple, Union
 
-from ..utils.constants import BINARY_EXTENSIONS, TEXT_EXTENSIONS
+from ..utils.constants import BINARY_EXTENSIONS, MAX_FILE_SIZE_BYTES, TEXT_EXTENSIONS
 from ..utils.file_utils import (
     decode_binary_content,
     is_binary_file,
@@ -14,6 +27,17 @@ from ..utils.file_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Text extracted from recent PDF/Word files keyed by (extension, content digest), so uploading
+# or sending the same document again skips extraction; parsing runs in worker threads, hence the lock
+_PARSE_CACHE: OrderedDict[Tuple[str, bytes], str] = OrderedDict()
+_PARSE_CACHE_SIZE = 32
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# PDF/Word extraction is pure-Python CPU work, so uploads are parsed in worker processes to use
+# more than one core; the pool is created on first use and shut down with the app
+PARSE_POOL_SIZE = max(1, (os.cpu_count() or 2) // 2)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
 
 def parse_file_content(file_name: str, file_content: str) -> Optional[str]:
     """
@@ -34,6 +58,10 @@ def parse_file_content(file_name: str, file_content: str) -> Optional[str]:
             if not file_ext.startswith('.'):
                 file_ext = '.' + file_ext
             if file_ext in BINARY_EXTENSIONS:
+                # Reject oversized files from their encoded length before allocating the decoded bytes
+                if len(base64_content) * 3 // 4 > MAX_FILE_SIZE_BYTES:
+                    logger.warning("Binary file %s exceeds %s bytes, skipping parse", file_name, MAX_FILE_SIZE_BYTES)
+                    return None
                 file_bytes = decode_binary_content(base64_content)
                 if file_bytes:
                     return parse_binary_file(file_ext, file_bytes)
@@ -46,39 +74,166 @@ def parse_file_content(file_name: str, file_content: str) -> Optional[str]:
     return None
 
 
-def parse_binary_file(file_ext: str, file_bytes: bytes) -> Optional[str]:
+def parse_binary_file(file_ext: str, file_bytes: Union[bytes, BinaryIO]) -> Optional[str]:
     """
-    Parse binary file (PDF/Word) from bytes.
+    Parse binary file (PDF/Word) from bytes or a binary file object.
     
     Args:
         file_ext: File extension (.pdf, .doc, .docx)
-        file_bytes: File content as bytes
+        file_bytes: File content as bytes, or a seekable binary file object read in place
     
     Returns:
         Extracted text content or None if parsing fails
     """
     try:
-        if file_ext == ".pdf":
-            return parse_pdf(file_bytes)
-        elif file_ext in [".doc", ".docx"]:
-            return parse_word(file_bytes, file_ext)
+        cache_key = (file_ext, _content_digest(file_bytes))
+        text = _cached_text(cache_key)
+        if text is None:
+            text = _extract_binary_text(file_ext, file_bytes)
+            _store_text(cache_key, text)
+        return text
     except Exception as e:
-        logger.error(f"Failed to parse binary file {file_ext}: {e}")
+        logger.error("Failed to parse binary file %s: %s", file_ext, e)
         return None
+
+
+async def parse_binary_file_in_pool(file_ext: str, file_obj: BinaryIO) -> Optional[str]:
+    """
+    Parse binary file (PDF/Word) in the parser process pool.
     
+    Args:
+        file_ext: File extension (.pdf, .doc, .docx)
+        file_obj: Seekable binary file object, e.g. a spooled upload
+    
+    Returns:
+        Extracted text content or None if parsing fails
+    """
+    loop = asyncio.get_running_loop()
+    # Worker processes can't share the file object, so it is copied to a named file in chunks while
+    # being hashed, off the event loop; the worker parses that file in place, so the upload is never
+    # held in memory as one bytes object
+    digest, path = await loop.run_in_executor(None, _copy_to_named_file, file_obj, file_ext)
+    try:
+        cache_key = (file_ext, digest)
+        text = _cached_text(cache_key)
+        if text is not None:
+            return text
+
+        global _parse_pool
+        if _parse_pool is None:
+            # Spawned workers don't inherit the server's threads and event loop the way forked ones would
+            _parse_pool = ProcessPoolExecutor(PARSE_POOL_SIZE, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            text = await loop.run_in_executor(_parse_pool, _extract_binary_text_from_path, file_ext, path)
+        except BrokenProcessPool as e:
+            # A crashed worker (e.g. killed for memory) breaks the whole pool; start a fresh one next time
+            logger.error("Parser process pool failed while parsing %s: %s", file_ext, e)
+            shutdown_parse_pool()
+            return None
+        except Exception as e:
+            logger.error("Failed to parse binary file %s: %s", file_ext, e)
+            return None
+        _store_text(cache_key, text)
+        return text
+    finally:
+        os.unlink(path)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parser process pool, cancelling queued parses."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _extract_binary_text(file_ext: str, file_bytes: Union[bytes, BinaryIO]) -> Optional[str]:
+    """Extract text from a PDF/Word file without consulting the cache."""
+    if file_ext == ".pdf":
+        return parse_pdf(file_bytes)
+    elif file_ext in [".doc", ".docx"]:
+        return parse_word(file_bytes, file_ext)
     return None
 
 
-def parse_pdf(file_bytes: bytes) -> Optional[str]:
+def _extract_binary_text_from_path(file_ext: str, path: str) -> Optional[str]:
+    """Extract text from a PDF/Word file on disk, reading it in place."""
+    with open(path, "rb") as f:
+        return _extract_binary_text(file_ext, f)
+
+
+def _copy_to_named_file(file_obj: BinaryIO, suffix: str) -> Tuple[bytes, str]:
+    """Copy a file object to a named temporary file in chunks, returning its content digest and path."""
+    hasher = _content_hasher()
+    file_obj.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        while chunk := file_obj.read(1 << 20):
+            hasher.update(chunk)
+            f.write(chunk)
+    return hasher.digest(), f.name
+
+
+def _cached_text(cache_key: Tuple[str, bytes]) -> Optional[str]:
+    """Get previously extracted text, marking it as recently used."""
+    with _PARSE_CACHE_LOCK:
+        text = _PARSE_CACHE.get(cache_key)
+        if text is not None:
+            _PARSE_CACHE.move_to_end(cache_key)
+        return text
+
+
+def _store_text(cache_key: Tuple[str, bytes], text: Optional[str]) -> None:
+    """Remember extracted text, evicting the least recently used entry when full."""
+    if text is None:
+        return
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[cache_key] = text
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+
+
+@functools.cache
+def _optional_import(name: str) -> Optional[ModuleType]:
+    """Import an optional parser library on first use, remembering when it is missing."""
+    # Failed imports are not cached by Python, so without this every upload would rescan sys.path
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _content_digest(file_bytes: Union[bytes, BinaryIO]) -> bytes:
+    """Hash file content, reading file objects in chunks rather than loading them whole."""
+    hasher = _content_hasher()
+    if isinstance(file_bytes, (bytes, bytearray)):
+        hasher.update(file_bytes)
+    else:
+        file_bytes.seek(0)
+        while chunk := file_bytes.read(1 << 20):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+def _content_hasher() -> hashlib.blake2b:
+    """Create the hasher used for parse cache keys."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def _as_stream(file_bytes: Union[bytes, BinaryIO]) -> BinaryIO:
+    """Wrap bytes in a stream; file objects are rewound and used as-is."""
+    if isinstance(file_bytes, (bytes, bytearray)):
+        return BytesIO(file_bytes)
+    file_bytes.seek(0)
+    return file_bytes
+
+
+def parse_pdf(file_bytes: Union[bytes, BinaryIO]) -> Optional[str]:
     """Parse PDF file and extract text."""
-    from io import BytesIO
-    
     try:
         # Try PyPDF2 first (more common)
-        try:
-            import PyPDF2
-            
-            pdf_file = BytesIO(file_bytes)
+        PyPDF2 = _optional_import("PyPDF2")
+        if PyPDF2 is not None:
+            pdf_file = _as_stream(file_bytes)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             
             text_parts = []
@@ -86,44 +241,39 @@ def parse_pdf(file_bytes: bytes) -> Optional[str]:
                 text_parts.append(page.extract_text())
             
             return "\n".join(text_parts)
-        except ImportError:
-            logger.warning("PyPDF2 not installed, trying pdfplumber")
+        logger.warning("PyPDF2 not installed, trying pdfplumber")
         
         # Fallback to pdfplumber
-        try:
-            import pdfplumber
-            
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    text_parts.append(page.extract_text() or "")
-                
-                return "\n".join(text_parts)
-        except ImportError:
+        pdfplumber = _optional_import("pdfplumber")
+        if pdfplumber is None:
             logger.warning("pdfplumber not installed, PDF parsing not available")
             return None
+
+        with pdfplumber.open(_as_stream(file_bytes)) as pdf:
+            text_parts = []
+            for page in pdf.pages:
+                text_parts.append(page.extract_text() or "")
+            
+            return "\n".join(text_parts)
             
     except Exception as e:
-        logger.error(f"Failed to parse PDF: {e}")
+        logger.error("Failed to parse PDF: %s", e)
         return None
 
 
-def parse_word(file_bytes: bytes, file_ext: str) -> Optional[str]:
+def parse_word(file_bytes: Union[bytes, BinaryIO], file_ext: str) -> Optional[str]:
     """Parse Word file (.doc or .docx) and extract text."""
-    from io import BytesIO
-    
     try:
         if file_ext == ".docx":
             # Use python-docx for .docx files
-            try:
-                from docx import Document
-                
-                doc = Document(BytesIO(file_bytes))
-                paragraphs = [para.text for para in doc.paragraphs]
-                return "\n".join(paragraphs)
-            except ImportError:
+            docx = _optional_import("docx")
+            if docx is None:
                 logger.warning("python-docx not installed, .docx parsing not available")
                 return None
+
+            doc = docx.Document(_as_stream(file_bytes))
+            paragraphs = [para.text for para in doc.paragraphs]
+            return "\n".join(paragraphs)
         elif file_ext == ".doc":
             # For .doc files, we'd need antiword or similar
             # For now, return None and suggest user to convert to .docx
@@ -131,7 +281,7 @@ def parse_word(file_bytes: bytes, file_ext: str) -> Optional[str]:
             return None
             
     except Exception as e:
-        logger.error(f"Failed to parse Word file: {e}")
+        logger.error("Failed to parse Word file: %s", e)
         return None
     
     return None
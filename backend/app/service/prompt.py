@@ -1,9 +1,10 @@
 """Prompt building for MRT review."""
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+from typing import List, Optional
 
-from ..config import get_config
+from ..config import Config, get_config
 from ..models import ChecklistItem
 
 
@@ -14,14 +15,47 @@ def build_checklist_string(checklist: list[ChecklistItem]) -> str:
     return "\n".join([f"- **{item.id}**: {item.description}" for item in checklist])
 
 
-def build_system_prompt(software_requirement: Optional[str] = None) -> str:
-    """Build system prompt from template. Reads checklist and template from config."""
+def build_system_prompts(software_requirement: Optional[str] = None) -> List[str]:
+    """Build one system prompt per checklist batch so large checklists are reviewed in parallel calls."""
+    has_requirement = bool(software_requirement and software_requirement.strip())
     config = get_config()
-    template = config.system_prompt_template
+    return config.cached(
+        ("review_system_prompts", has_requirement),
+        lambda: _render_system_prompts(config, has_requirement),
+    )
+
+
+def system_prompts_digest(software_requirement: Optional[str] = None) -> bytes:
+    """Get a digest of the review system prompts; it changes whenever the config that renders them changes."""
+    has_requirement = bool(software_requirement and software_requirement.strip())
+    config = get_config()
+
+    def digest() -> bytes:
+        hasher = hashlib.blake2b(digest_size=16)
+        for prompt in build_system_prompts(software_requirement):
+            hasher.update(prompt.encode("utf-8"))
+            hasher.update(b"\0")
+        return hasher.digest()
+
+    return config.cached(("review_system_prompts_digest", has_requirement), digest)
+
+
+def _render_system_prompts(config: Config, has_requirement: bool) -> List[str]:
+    """Render the review system prompt for each checklist batch."""
     checklist = config.default_checklist
+    size = config.checklist_batch_size
+    return [
+        _render_system_prompt(config, has_requirement, checklist[start:start + size])
+        for start in range(0, max(len(checklist), 1), size)
+    ]
+
+
+def _render_system_prompt(config: Config, has_requirement: bool, checklist: List[ChecklistItem]) -> str:
+    """Render the review system prompt template for the given checklist items."""
+    template = config.system_prompt_template
     checklist_string = build_checklist_string(checklist)
     
-    if software_requirement and software_requirement.strip():
+    if has_requirement:
         requirement_section = """### Software Requirements
 When software requirements are provided, ensure that:
 1. Each software requirement is covered by one or more test cases
@@ -1,7 +1,7 @@
 """Review service for MRT content."""
 from __future__ import annotations
 
-from typing import Optional
+from typing import AsyncGenerator, Optional
 
 from ..llm import LLMClient
 from ..models import ReviewRequest, ReviewResponse
@@ -10,14 +10,24 @@ from ..models import ReviewRequest, ReviewResponse
 class ReviewService:
     """Service for reviewing MRT content."""
 
+    __slots__ = ("llm_client",)
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
         """Initialize review service."""
         self.llm_client = llm_client or LLMClient()
 
-    def review(self, request: ReviewRequest) -> ReviewResponse:
+    async def review(self, request: ReviewRequest) -> ReviewResponse:
         """Review MRT content based on request."""
-        return self.llm_client.review(
+        return await self.llm_client.review(
             mrt_content=request.mrt_content,
             software_requirement=request.software_requirement,
         )
 
+    async def review_stream(self, request: ReviewRequest) -> AsyncGenerator[str, None]:
+        """Review MRT content based on request, yielding the review text as it is generated."""
+        async for chunk in self.llm_client.review_stream(
+            mrt_content=request.mrt_content,
+            software_requirement=request.software_requirement,
+        ):
+            yield chunk
+
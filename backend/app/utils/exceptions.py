@@ -32,6 +32,8 @@ def format_error_message(error: Exception, default_message: str = "An error occu
     error_str = str(error)
     if not error_str:
         return default_message
+    # Lowercased once for the case-insensitive checks below
+    lowered = error_str.lower()
     
     # Handle DNS/network resolution errors
     if "nodename nor servname provided" in error_str or "not known" in error_str:
@@ -41,22 +43,22 @@ def format_error_message(error: Exception, default_message: str = "An error occu
             "3) Firewall or proxy blocking the connection. "
             "Please check your network connection and try again."
         )
-    elif "Connection reset" in error_str or "Connection reset by peer" in error_str:
+    elif "Connection reset" in error_str:
         return (
             "Connection was reset. This might be due to large file size or network instability. "
             "Please try: 1) Upload smaller files 2) Check network connection 3) Retry later"
         )
-    elif "timeout" in error_str.lower() or "timed out" in error_str.lower():
+    elif "timeout" in lowered or "timed out" in lowered:
         return (
             "Request timeout: Processing took too long. "
             "Please try uploading smaller files or upload in batches."
         )
-    elif "Connection" in error_str or "connect" in error_str.lower():
+    elif "connect" in lowered:
         return (
             "Connection error: Unable to connect to AI service. "
             "Please check network connection or retry later."
         )
-    elif "Name or service not known" in error_str or "getaddrinfo failed" in error_str:
+    elif "getaddrinfo failed" in error_str:
         return (
             "DNS resolution error: Unable to resolve the server address. "
             "Please check your network connection and DNS settings."
@@ -28,17 +28,19 @@ def parse_binary_file_marker(file_content: str) -> tuple[Optional[str], Optional
         return None, None
     
     try:
-        content = file_content[len(BINARY_FILE_PREFIX):]
-        if content.endswith(BINARY_FILE_SUFFIX):
-            content = content[:-len(BINARY_FILE_SUFFIX)]
+        # Locate the fields by offset so the (possibly multi-MB) payload is sliced exactly once
+        start = len(BINARY_FILE_PREFIX)
+        end = len(file_content)
+        if file_content.endswith(BINARY_FILE_SUFFIX):
+            end -= len(BINARY_FILE_SUFFIX)
         
-        parts = content.split(":", 1)
-        file_ext = parts[0] if parts else ""
-        base64_content = parts[1] if len(parts) > 1 else ""
+        separator = file_content.find(":", start, end)
+        if separator < 0:
+            return file_content[start:end], ""
         
-        return file_ext, base64_content
+        return file_content[start:separator], file_content[separator + 1:end]
     except Exception as e:
-        logger.error(f"Failed to parse binary file marker: {e}")
+        logger.error("Failed to parse binary file marker: %s", e)
         return None, None
 
 
@@ -47,35 +49,27 @@ def decode_binary_content(base64_content: str) -> Optional[bytes]:
     try:
         return base64.b64decode(base64_content)
     except Exception as e:
-        logger.error(f"Failed to decode base64 content: {e}")
+        logger.error("Failed to decode base64 content: %s", e)
         return None
 
 
 def is_text_file(file_name: str) -> bool:
     """Check if file is a text file based on extension."""
-    file_name_lower = file_name.lower()
-    return any(file_name_lower.endswith(ext) for ext in TEXT_EXTENSIONS)
+    return file_name.lower().endswith(TEXT_EXTENSIONS)
 
 
-def truncate_content(content: str, max_size: int, file_name: str = "") -> str:
+def truncation_note(original_size: int, file_name: str = "") -> str:
     """
-    Truncate content if it exceeds max size.
+    Build the note appended to truncated content.
     
     Args:
-        content: Content to truncate
-        max_size: Maximum size in characters
-        file_name: Optional file name for error message
+        original_size: Size of the content before truncation, in characters
+        file_name: Optional file name for the note
         
     Returns:
-        Truncated content with note if truncated
+        Note describing the truncation
     """
-    if len(content) <= max_size:
-        return content
-    
-    truncated = content[:max_size]
-    note = f"\n\n[Note: File content truncated. Original size: {len(content)} characters]"
     if file_name:
-        note = f"\n\n[Note: {file_name} content truncated. Original size: {len(content)} characters]"
-    
-    return truncated + note
+        return f"\n\n[Note: {file_name} content truncated. Original size: {original_size} characters]"
+    return f"\n\n[Note: File content truncated. Original size: {original_size} characters]"
 
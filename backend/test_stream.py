@@ -1,45 +1,43 @@
 #!/usr/bin/env python3
 """Test OpenAI API with streaming."""
 import os
-from openai import OpenAI
 
-api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-client = OpenAI(api_key=api_key)
 
-stream = client.chat.completions.create(
-    model="gpt-4",
-    messages=[{"role": "user", "content": "Count from 1 to 5"}],
-    stream=True
-)
+def main():
+    # openai isn't a backend requirement; import it only when the probe actually runs
+    from openai import OpenAI
 
-print("Streaming response:")
-for chunk in stream:
-    if chunk.choices[0].delta.content is not None:
-        print(chunk.choices[0].delta.content, end="", flush=True)
-print()  # New line at the end
+    api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
+    client = OpenAI(api_key=api_key)
 
-
-
-#!/usr/bin/env python3
-"""Quick OpenAI API test."""
-import os
-from openai import OpenAI
-
-# 设置你的 API key
-api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-
-# 创建客户端
-client = OpenAI(api_key=api_key)
-
-# 发送请求
-try:
-    response = client.chat.completions.create(
+    stream = client.chat.completions.create(
         model="gpt-4",
-        messages=[{"role": "user", "content": "Hello! Just say 'API is working'."}],
-        max_tokens=20
+        messages=[{"role": "user", "content": "Count from 1 to 5"}],
+        stream=True
     )
-    
-    print("✅ Success!")
-    print(f"Response: {response.choices[0].message.content}")
-except Exception as e:
-    print(f"❌ Error: {e}")
\ No newline at end of file
+
+    print("Streaming response:")
+    for chunk in stream:
+        if chunk.choices[0].delta.content is not None:
+            print(chunk.choices[0].delta.content, end="", flush=True)
+    print()  # New line at the end
+
+    # 复用上面的客户端，第二个请求沿用已建立的连接，无需重新握手
+    # 发送请求
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4",
+            # 只需确认认证和路由可用，一个输出 token 足够
+            messages=[{"role": "user", "content": "."}],
+            max_tokens=1
+        )
+        
+        print("✅ Success!")
+        print(f"Response: {response.choices[0].message.content}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+# Only probe when run as a script; pytest collects test_*.py files and would otherwise make billed API calls on import
+if __name__ == "__main__":
+    main()
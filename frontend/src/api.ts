@@ -1,4 +1,4 @@
-import type { ChatPayload, ChecklistItem, ReviewPayload, ReviewResponse } from './types'
+import type { ChatPayload, ChecklistItem, ReviewPayload } from './types'
 
 const API_BASE_URL = (import.meta.env.VITE_API_BASE_URL as string | undefined) ?? 'http://localhost:8000'
 
@@ -10,15 +10,20 @@ async function handleResponse<T>(response: Response): Promise<T> {
   return response.json() as Promise<T>
 }
 
-export async function reviewMrt(payload: ReviewPayload): Promise<ReviewResponse> {
-  const response = await fetch(`${API_BASE_URL}/review`, {
+export async function reviewMrtStream(
+  payload: ReviewPayload,
+  onChunk: (chunk: string) => void,
+  onDone: () => void,
+  onError: (error: string) => void
+): Promise<void> {
+  const response = await fetch(`${API_BASE_URL}/review/stream`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
     },
     body: JSON.stringify(payload),
   })
-  return handleResponse<ReviewResponse>(response)
+  return readEventStream(response, onChunk, onDone, onError)
 }
 
 export async function sendChatMessageStream(
@@ -34,7 +39,15 @@ export async function sendChatMessageStream(
     },
     body: JSON.stringify(payload),
   })
+  return readEventStream(response, onChunk, onDone, onError)
+}
 
+async function readEventStream(
+  response: Response,
+  onChunk: (chunk: string) => void,
+  onDone: () => void,
+  onError: (error: string) => void
+): Promise<void> {
   if (!response.ok) {
     const detail = await response.text()
     throw new Error(detail || `Request failed with status ${response.status}`)
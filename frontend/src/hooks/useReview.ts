@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import type { ReviewResponse, ChecklistItem, Alert } from '../types'
-import { reviewMrt } from '../api'
+import { reviewMrtStream } from '../api'
 
 export function useReview() {
   const [mrtContent, setMrtContent] = useState('')
@@ -29,9 +29,28 @@ export function useReview() {
         system_prompt: customSystemPrompt,
       }
 
-      const response = await reviewMrt(payload)
-      setResult(response)
-      setAlert({ type: 'success', message: 'Review completed' })
+      // Show the review as it streams in
+      let rawContent = ''
+      let finished = false
+      await reviewMrtStream(
+        payload,
+        (chunk) => {
+          rawContent += chunk
+          setResult({ suggestions: [], raw_content: rawContent })
+        },
+        () => {
+          finished = true
+          setAlert({ type: 'success', message: 'Review completed' })
+        },
+        (message) => {
+          finished = true
+          setAlert({ type: 'error', message })
+        }
+      )
+      // A stream cut off before its done/error event means the review is incomplete
+      if (!finished) {
+        throw new Error('Review stream ended before the review completed')
+      }
     } catch (error) {
       const message = error instanceof Error ? error.message : 'Review failed'
       setAlert({ type: 'error', message })